@@ -0,0 +1,69 @@
+"""
+Unit tests for the aggregator's weighted category voting
+Run from this directory: python -m pytest test_aggregator.py
+"""
+
+import random
+
+import pytest
+
+from app import (
+    CategoryVote,
+    EvidenceSource,
+    IssueCategory,
+    _CATEGORIES,
+    _score_votes,
+    _score_votes_batch,
+)
+
+
+def _vote(category: IssueCategory, confidence: float, weight: float = 1.0) -> CategoryVote:
+    return CategoryVote(
+        source=EvidenceSource.TEXT, category=category, confidence=confidence, weight=weight
+    )
+
+
+def _random_votes(rng: random.Random) -> list:
+    return [
+        _vote(
+            rng.choice(_CATEGORIES),
+            rng.choice([0.0, round(rng.random(), 2)]),
+            rng.choice([0.0, 0.5, 1.0, 1.5]),
+        )
+        for _ in range(rng.randint(0, 6))
+    ]
+
+
+def _assert_same(batch, single):
+    assert len(batch) == len(single)
+    for (batch_cat, batch_conf), (cat, conf) in zip(batch, single):
+        assert batch_cat == cat
+        assert batch_conf == pytest.approx(conf)
+
+
+def test_single_package_matches():
+    votes = [_vote(IssueCategory.SAFETY, 0.9), _vote(IssueCategory.QUALITY, 0.6, 1.5)]
+    assert _score_votes_batch([votes]) == [_score_votes(votes)]
+
+
+def test_empty_and_all_zero_packages():
+    packages = [
+        [],
+        [_vote(IssueCategory.QUALITY, 0.0), _vote(IssueCategory.SAFETY, 0.8, 0.0)],
+    ]
+    _assert_same(_score_votes_batch(packages), [_score_votes(votes) for votes in packages])
+    assert _score_votes([]) == (IssueCategory.UNKNOWN, 0.0)
+    assert _score_votes(packages[1]) == (IssueCategory.QUALITY, 0.0)
+
+
+def test_ties_go_to_lower_ordinal():
+    first, second = _CATEGORIES[1], _CATEGORIES[4]
+    votes = [_vote(second, 0.5), _vote(first, 0.5)]
+    assert _score_votes(votes) == (first, 0.5)
+    assert _score_votes_batch([votes]) == [(first, 0.5)]
+
+
+def test_batch_matches_single_on_random_packages():
+    rng = random.Random(0)
+    packages = [_random_votes(rng) for _ in range(300)]
+    _assert_same(_score_votes_batch(packages), [_score_votes(votes) for votes in packages])
@@ -5,21 +5,42 @@ Provides context-aware assistance using Gemini AI with Multi-tenant RAG
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Optional, Dict
+from typing import AsyncIterator, List, Optional, Dict, Tuple
+from contextlib import asynccontextmanager
 from google import genai
+from shared.semantic_cache import SemanticCache
+import asyncio
 import httpx
+import numpy as np
+import orjson
 import os
+import re
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan handler"""
+    # Shared client so calls to the RAG service reuse pooled keep-alive connections
+    app.state.http = httpx.AsyncClient(
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    )
+    yield
+    await app.state.http.aclose()
+
 app = FastAPI(
     title="SmartClaim Chat Assistant",
     description="RAG-powered chatbot for SmartClaim using Gemini",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -40,6 +61,36 @@ client = genai.Client(api_key=GEMINI_API_KEY)
 # RAG Service URL
 RAG_SERVICE_URL = os.getenv("RAG_SERVICE_URL", "http://rag:8004")
 
+# Sliding history window: last N messages, trimmed oldest-first to a token budget
+HISTORY_WINDOW = int(os.getenv("CHAT_HISTORY_WINDOW", "10"))
+HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "3000"))
+
+GEMINI_MODEL = "gemini-2.5-flash"
+
+# Cap concurrent Gemini calls. Slots are taken on the event loop, so waiting
+# callers hold no threads; blocking calls run on their own pool, sized to the
+# cap, and free their slot only when the call has really returned (cancelling
+# the awaiting task does not stop a call already running in its thread)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+_gemini_slots = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+_gemini_pool = ThreadPoolExecutor(max_workers=GEMINI_MAX_CONCURRENCY, thread_name_prefix="gemini")
+
+# Start the direct Gemini answer alongside RAG instead of after a RAG miss.
+# Saves a round trip on misses, but on every RAG hit the speculative call
+# still runs to completion and is billed, so it is off by default
+GEMINI_SPECULATIVE = os.getenv("GEMINI_SPECULATIVE", "false").lower() == "true"
+
+# Semantic cache for RAG answers: near-duplicate questions from the same
+# tenant scope reuse an earlier answer instead of re-querying RAG. The
+# threshold is stricter than the classifier's, since a whole answer is reused
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-004")
+rag_cache = SemanticCache(
+    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.98")),
+    maxsize=int(os.getenv("SEMANTIC_CACHE_SIZE", "2048")),
+    ttl=float(os.getenv("SEMANTIC_CACHE_TTL", "3600")),
+)
+
 class Message(BaseModel):
     role: str
     content: str
@@ -51,6 +102,7 @@ class ChatRequest(BaseModel):
     department_id: Optional[str] = None
     history: Optional[List[Message]] = []
     use_rag: Optional[bool] = True  # Enable RAG by default
+    stream: Optional[bool] = False  # Stream the answer as server-sent events
 
 class ChatResponse(BaseModel):
     message: str
@@ -88,6 +140,13 @@ You help admins:
 Provide strategic insights and system optimization recommendations."""
 }
 
+_ROLE_LABEL = {"user": "User"}.get
+
+# System prompt plus the blank-line separator, built once per role at import
+_ROLE_PREFIX = {role: prompt + "\n\n" for role, prompt in SYSTEM_PROMPTS.items()}
+DEFAULT_SYSTEM = _ROLE_PREFIX["worker"]
+_role_prefix = _ROLE_PREFIX.get
+
 async def query_rag_service(
     query: str,
     user_id: str,
@@ -98,30 +157,72 @@ async def query_rag_service(
     Query the RAG service for relevant context with multi-tenant filtering
     """
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{RAG_SERVICE_URL}/query",
-                json={
-                    "query": query,
-                    "user_context": {
-                        "user_id": user_id,
-                        "role": user_role,
-                        "department_id": department_id
-                    },
-                    "include_sources": True,
-                    "rerank": True
-                }
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"RAG service error: {response.status_code} - {response.text}")
-                return None
+        response = await app.state.http.post(
+            f"{RAG_SERVICE_URL}/query",
+            json={
+                "query": query,
+                "user_context": {
+                    "user_id": user_id,
+                    "role": user_role,
+                    "department_id": department_id
+                },
+                "include_sources": True,
+                "rerank": True
+            }
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            logger.error(f"RAG service error: {response.status_code} - {response.text}")
+            return None
     except Exception as e:
         logger.error(f"Error querying RAG service: {str(e)}")
         return None
 
+# Questions naming a ticket, date, amount or mention ("status of ticket 1042")
+# embed almost like their neighbours ("...1043") but need their own answer
+_IDENTIFIER_RE = re.compile(r"[\d#@]")
+
+def rag_cacheable(query: str) -> bool:
+    """Whether the semantic cache may answer query"""
+    return SEMANTIC_CACHE_ENABLED and not _IDENTIFIER_RE.search(query)
+
+async def embed_text(text: str) -> Optional[np.ndarray]:
+    """Embed text for cache lookups; None disables caching for this request"""
+    try:
+        result = await asyncio.to_thread(
+            client.models.embed_content, model=EMBEDDING_MODEL, contents=text
+        )
+        return np.asarray(result.embeddings[0].values, dtype=np.float32)
+    except Exception as e:
+        logger.warning(f"Embedding failed, skipping semantic cache: {str(e)}")
+        return None
+
+async def rag_cache_lookup(
+    embedding: Optional[asyncio.Task], scope: Tuple
+) -> Tuple[Optional[np.ndarray], Optional[Dict]]:
+    """
+    Probe the semantic cache for an earlier RAG answer.
+    
+    embedding is the query's embed_text task (None if the query is not
+    cacheable). Entries are namespaced by the caller's tenant scope (user,
+    role, department) so answers never cross tenants. Returns the query
+    embedding, for storing a fresh answer, and the cached answer if any.
+    """
+    vec = await embedding if embedding is not None else None
+    if vec is None:
+        return None, None
+    cached = rag_cache.get(vec, namespace=scope)
+    if cached is not None:
+        logger.info("RAG answer served from semantic cache")
+    return vec, cached
+
+def rag_cache_store(vec: Optional[np.ndarray], scope: Tuple, rag_response: Optional[Dict]) -> None:
+    """Cache a RAG answer, but only one grounded in retrieved context"""
+    if vec is not None and rag_response and rag_response.get("context_used"):
+        rag_cache.set(vec, rag_response, namespace=scope)
+
 async def get_relevant_context(query: str, user_role: str, department_id: Optional[str] = None):
     """
     Retrieve relevant context from vector database (legacy method)
@@ -134,91 +235,206 @@ async def get_relevant_context(query: str, user_role: str, department_id: Option
         logger.error(f"Error retrieving context: {str(e)}")
         return []
 
+def _chat_response(result: ChatResponse) -> Response:
+    """
+    Serialize the already-validated ChatResponse once and return the bytes.
+    
+    Returning a Response directly skips FastAPI's response_model re-validation;
+    response_model stays on the route for the OpenAPI schema.
+    """
+    return Response(content=result.model_dump_json(), media_type="application/json")
+
+def _build_prompt(request: ChatRequest) -> str:
+    """Role prompt + windowed conversation history + the new user message"""
+    lines = [
+        f"{_ROLE_LABEL(msg.role, 'Assistant')}: {msg.content}"
+        for msg in request.history[-HISTORY_WINDOW:]
+    ]
+    # ~4 characters per token; drop the oldest turns until the history fits
+    budget_chars = HISTORY_TOKEN_BUDGET * 4
+    used_chars = sum(len(line) + 1 for line in lines)
+    start = 0
+    while start < len(lines) and used_chars > budget_chars:
+        used_chars -= len(lines[start]) + 1
+        start += 1
+    conversation_history = "\n".join(lines[start:])
+    history_section = f"Conversation history:\n{conversation_history}\n\n" if conversation_history else ""
+    return f"{_role_prefix(request.user_role, DEFAULT_SYSTEM)}{history_section}User: {request.message}\nAssistant:"
+
+def _generate(prompt: str) -> str:
+    return client.models.generate_content(model=GEMINI_MODEL, contents=prompt).text
+
+async def _gemini_reply(prompt: str) -> str:
+    """Stateless Gemini call; the SDK is sync, so run it on the Gemini pool"""
+    await _gemini_slots.acquire()
+    loop = asyncio.get_running_loop()
+    call = _gemini_pool.submit(_generate, prompt)
+    # Released when the call finishes (or is cancelled before it starts),
+    # not when this task is cancelled
+    call.add_done_callback(lambda _: loop.call_soon_threadsafe(_gemini_slots.release))
+    return await asyncio.wrap_future(call)
+
+async def _gemini_stream(prompt: str) -> AsyncIterator[str]:
+    """Yield Gemini's answer in chunks as they are generated"""
+    await _gemini_slots.acquire()
+    try:
+        stream = await client.aio.models.generate_content_stream(model=GEMINI_MODEL, contents=prompt)
+        async for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+    finally:
+        _gemini_slots.release()
+
+async def _single_chunk(text: str) -> AsyncIterator[str]:
+    yield text
+
+def _sse(payload: dict) -> bytes:
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+async def _sse_events(chunks: AsyncIterator[str], sources, confidence: float) -> AsyncIterator[bytes]:
+    """
+    Server-sent events for a streamed answer.
+    
+    Each text chunk is sent as {"delta": ...}; the stream ends with
+    {"done": true, "sources": [...], "confidence": ...} or {"error": ...}.
+    """
+    try:
+        async for text in chunks:
+            yield _sse({"delta": text})
+    except Exception as e:
+        logger.error(f"Chat stream error: {str(e)}")
+        yield _sse({"error": f"Chat error: {str(e)}"})
+        return
+    yield _sse({"done": True, "sources": list(sources), "confidence": confidence})
+
+def _chat_stream(chunks: AsyncIterator[str], sources, confidence: float) -> StreamingResponse:
+    return StreamingResponse(
+        _sse_events(chunks, sources, confidence),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+def _discard(task: Optional[asyncio.Task]) -> None:
+    """Cancel a speculative task that is no longer needed, consuming any error it already raised"""
+    if task is not None and not task.cancel() and not task.cancelled():
+        task.exception()
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
     Process chat message with Gemini AI and Multi-tenant RAG
+    
+    With stream=true the answer is sent as server-sent events instead of
+    a single ChatResponse.
     """
+    gemini_task = None
+    rag_task = None
     try:
         logger.info(f"Chat request from user {request.user_id} (role: {request.user_role})")
         
-        rag_response = None
-        context = ""
-        sources = []
+        sources = ()
         
         # Try to get context from RAG service (with multi-tenant filtering)
         if request.use_rag:
-            rag_response = await query_rag_service(
+            scope = (request.user_id, request.user_role, request.department_id)
+            # The cache embedding runs alongside retrieval rather than before
+            # it; a cache hit (embedding is much faster than RAG) cancels RAG
+            embed_task = asyncio.create_task(embed_text(request.message)) if rag_cacheable(request.message) else None
+            rag_task = asyncio.create_task(query_rag_service(
                 query=request.message,
                 user_id=request.user_id,
                 user_role=request.user_role,
                 department_id=request.department_id
-            )
+            ))
+            vec, rag_response = await rag_cache_lookup(embed_task, scope)
+            
+            if rag_response is not None:
+                _discard(rag_task)
+            else:
+                # Optionally start the direct Gemini fallback speculatively so a
+                # RAG miss costs max(RAG, Gemini) rather than RAG + Gemini.
+                # Streaming requests start generating only on a miss, since
+                # their first token arrives early anyway
+                if GEMINI_SPECULATIVE and not request.stream:
+                    gemini_task = asyncio.create_task(_gemini_reply(_build_prompt(request)))
+                    await asyncio.wait({rag_task, gemini_task}, return_when=asyncio.FIRST_COMPLETED)
+                # RAG is preferred even when Gemini finished first
+                rag_response = await rag_task
+                rag_cache_store(vec, scope, rag_response)
+            
+            if rag_response:
+                sources = rag_response.get("sources") or ()
             
             if rag_response and rag_response.get("context_used"):
                 # RAG service already generated a response with context
                 logger.info(f"Using RAG response with {rag_response.get('num_chunks_retrieved', 0)} chunks")
-                return ChatResponse(
+                confidence = 0.95 if sources else 0.85
+                if request.stream:
+                    return _chat_stream(_single_chunk(rag_response.get("answer", "")), sources, confidence)
+                if gemini_task is not None:
+                    # The call keeps running in its thread and is still billed
+                    logger.info("Discarding speculative Gemini answer after RAG hit")
+                    _discard(gemini_task)
+                return _chat_response(ChatResponse(
                     message=rag_response.get("answer", ""),
-                    sources=rag_response.get("sources", []),
-                    confidence=0.95 if rag_response.get("sources") else 0.85
-                )
-            elif rag_response:
-                # RAG found no context, but provided a response
-                sources = rag_response.get("sources", [])
+                    sources=sources,
+                    confidence=confidence
+                ))
         
         # Fallback to direct Gemini call if RAG is disabled or no context found
-        system_prompt = SYSTEM_PROMPTS.get(request.user_role, SYSTEM_PROMPTS["worker"])
-        
-        # Prepare conversation history
-        conversation_history = ""
-        for msg in request.history[-10:]:  # Last 10 messages
-            role_label = "User" if msg.role == "user" else "Assistant"
-            conversation_history += f"{role_label}: {msg.content}\n"
-        
-        # Build complete prompt
-        history_section = f"Conversation history:\n{conversation_history}\n" if conversation_history else ""
-        
-        full_prompt = f"{system_prompt}\n\n{history_section}User: {request.message}\nAssistant:"
-        
-        # Call Gemini API directly
-        chat_session = client.chats.create(model="gemini-2.5-flash")
-        response = chat_session.send_message(full_prompt)
-        
-        assistant_message = response.text
+        if request.stream:
+            return _chat_stream(_gemini_stream(_build_prompt(request)), sources, 0.7)
+        if gemini_task is None:
+            gemini_task = asyncio.create_task(_gemini_reply(_build_prompt(request)))
+        assistant_message = await gemini_task
         
         logger.info(f"Generated response for user {request.user_id}")
         
-        return ChatResponse(
+        return _chat_response(ChatResponse(
             message=assistant_message,
             sources=sources,
             confidence=0.7  # Lower confidence without RAG context
-        )
+        ))
         
     except Exception as e:
+        _discard(gemini_task)
+        _discard(rag_task)
         logger.error(f"Chat error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
 
+# Health payloads differ only by RAG status, so serialize each variant once
+_HEALTH_BYTES = {
+    rag_status: orjson.dumps({
+        "status": "healthy",
+        "service": "chat-assistant",
+        "version": "1.0.0",
+        "llm_available": bool(GEMINI_API_KEY),
+        "rag_service": rag_status
+    })
+    for rag_status in ("unknown", "healthy", "unhealthy", "unavailable")
+}
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     # Check RAG service availability
     rag_status = "unknown"
     try:
-        async with httpx.AsyncClient(timeout=5.0) as http_client:
-            response = await http_client.get(f"{RAG_SERVICE_URL}/health")
-            rag_status = "healthy" if response.status_code == 200 else "unhealthy"
+        response = await app.state.http.get(f"{RAG_SERVICE_URL}/health", timeout=5.0)
+        rag_status = "healthy" if response.status_code == 200 else "unhealthy"
     except:
         rag_status = "unavailable"
     
-    return {
-        "status": "healthy",
-        "service": "chat-assistant",
-        "version": "1.0.0",
-        "llm_available": bool(GEMINI_API_KEY),
-        "rag_service": rag_status
-    }
+    return Response(content=_HEALTH_BYTES[rag_status], media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8002,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+    )
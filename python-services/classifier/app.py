@@ -6,21 +6,41 @@ Uses LLM to classify tickets and generate summaries
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from typing import Optional, List
 from google import genai
+from google.genai import types
+from shared.semantic_cache import SemanticCache
+from lexicon import CATEGORY_DEPARTMENT, Category, lead_summary, lexicon_hits
+from cachetools import TTLCache
+import asyncio
+import hashlib
+import numpy as np
 import os
+import threading
+import time
 import logging
 from enum import Enum
-import json
+from contextlib import asynccontextmanager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan handler"""
+    app.state.classify_queue = asyncio.Queue()
+    batch_worker = asyncio.create_task(_classify_batch_worker(app.state.classify_queue))
+    yield
+    batch_worker.cancel()
+
 app = FastAPI(
     title="SmartClaim Classifier",
     description="Classify and summarize tickets using LLM",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -38,13 +58,36 @@ if not GEMINI_API_KEY:
     raise ValueError("GEMINI_API_KEY environment variable is required")
 client = genai.Client(api_key=GEMINI_API_KEY)
 
-class Category(str, Enum):
-    SAFETY = "safety"
-    QUALITY = "quality"
-    MAINTENANCE = "maintenance"
-    LOGISTICS = "logistics"
-    HR = "hr"
-    OTHER = "other"
+# Exact cache: byte-identical texts (retries, duplicate submissions) skip Gemini entirely
+exact_cache: TTLCache = TTLCache(
+    maxsize=int(os.getenv("EXACT_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("EXACT_CACHE_TTL", "3600")),
+)
+exact_cache_stats = {"hits": 0, "misses": 0}
+
+# Semantic cache: near-duplicate ticket texts reuse an earlier classification's
+# labels (category, priority, department); per-text fields are rebuilt locally
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-004")
+semantic_cache = SemanticCache(
+    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+    maxsize=int(os.getenv("SEMANTIC_CACHE_SIZE", "2048")),
+    ttl=float(os.getenv("SEMANTIC_CACHE_TTL", "3600")),
+)
+SEMANTIC_HIT_CONFIDENCE = float(os.getenv("SEMANTIC_HIT_CONFIDENCE", "0.8"))
+
+async def embed_text(text: str) -> Optional[np.ndarray]:
+    """Embed text for cache lookups; None disables caching for this request"""
+    if not SEMANTIC_CACHE_ENABLED:
+        return None
+    try:
+        result = await asyncio.to_thread(
+            client.models.embed_content, model=EMBEDDING_MODEL, contents=text
+        )
+        return np.asarray(result.embeddings[0].values, dtype=np.float32)
+    except Exception as e:
+        logger.warning(f"Embedding failed, skipping semantic cache: {str(e)}")
+        return None
 
 class Priority(str, Enum):
     LOW = "low"
@@ -159,6 +202,249 @@ TEXT: "Il y a une flaque d'eau près de l'escalier"
 → reasoning: "Slip hazard potential but no incident occurred — flagged for review"
 </EXAMPLES>"""
 
+# Split once at import so each request only concatenates the ticket text in;
+# str.format would also have unescaped the doubled braces of the JSON example
+SYSTEM_CONTEXT = "You are a workplace safety and quality expert."
+_prompt_head, _prompt_tail = (
+    part.replace("{{", "{").replace("}}", "}") for part in CLASSIFICATION_PROMPT.split("{text}")
+)
+PROMPT_PREFIX = SYSTEM_CONTEXT + "\n\n" + _prompt_head
+PROMPT_SUFFIX = _prompt_tail
+
+# Gemini context cache for the static prompt prefix: after the first call
+# only the ticket text and the short suffix pay prefill
+GEMINI_MODEL = "gemini-2.5-flash"
+PROMPT_CACHE_ENABLED = os.getenv("PROMPT_CACHE_ENABLED", "true").lower() == "true"
+PROMPT_CACHE_TTL = int(os.getenv("PROMPT_CACHE_TTL", "3600"))
+_prompt_cache = {"name": None, "valid_until": 0.0}
+_prompt_cache_lock = threading.Lock()
+
+def cached_prefix_name() -> Optional[str]:
+    """Name of the cached content holding PROMPT_PREFIX, recreated shortly before it expires"""
+    if time.monotonic() < _prompt_cache["valid_until"]:
+        return _prompt_cache["name"]
+    # Gemini calls run in worker threads; only one of them should (re)create the cache
+    with _prompt_cache_lock:
+        now = time.monotonic()
+        if now < _prompt_cache["valid_until"]:
+            return _prompt_cache["name"]
+        try:
+            cached = client.caches.create(
+                model=GEMINI_MODEL,
+                config=types.CreateCachedContentConfig(
+                    contents=[PROMPT_PREFIX],
+                    ttl=f"{PROMPT_CACHE_TTL}s",
+                ),
+            )
+            _prompt_cache.update(name=cached.name, valid_until=now + PROMPT_CACHE_TTL - 60)
+            logger.info(f"Created prompt cache {cached.name}")
+        except Exception as e:
+            # Back off before retrying; requests use the full prompt meanwhile
+            logger.warning(f"Prompt cache unavailable, sending full prompt: {str(e)}")
+            _prompt_cache.update(name=None, valid_until=now + 300)
+        return _prompt_cache["name"]
+
+def _generate(tail: str, schema) -> str:
+    """Send PROMPT_PREFIX + tail to Gemini with a JSON response schema; returns the raw JSON"""
+    cache_name = cached_prefix_name() if PROMPT_CACHE_ENABLED else None
+    if cache_name:
+        try:
+            response = client.models.generate_content(
+                model=GEMINI_MODEL,
+                contents=tail,
+                config=types.GenerateContentConfig(
+                    cached_content=cache_name,
+                    response_mime_type="application/json",
+                    response_schema=schema,
+                ),
+            )
+            return response.text
+        except Exception as e:
+            # Cache may have been evicted server-side; rebuild it on the next request
+            logger.warning(f"Cached prompt call failed, retrying with full prompt: {str(e)}")
+            _prompt_cache["valid_until"] = 0.0
+    
+    response = client.models.generate_content(
+        model=GEMINI_MODEL,
+        contents=PROMPT_PREFIX + tail,
+        config=types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=schema,
+        ),
+    )
+    return response.text
+
+def generate_classification(text: str) -> str:
+    """Run the classification prompt for text and return Gemini's raw JSON reply"""
+    return _generate(text + PROMPT_SUFFIX, ClassificationResponse)
+
+# ============================================
+# MICRO-BATCHING
+# ============================================
+
+# Concurrent /classify misses are coalesced into one Gemini call so the
+# round-trip and the shared prompt prefix are paid once per batch
+BATCH_MAX_SIZE = int(os.getenv("CLASSIFY_BATCH_MAX_SIZE", "16"))
+BATCH_WINDOW_S = float(os.getenv("CLASSIFY_BATCH_WINDOW_MS", "20")) / 1000
+
+BATCH_INSTRUCTIONS = """
+
+<BATCH>
+The INPUT above contains {n} TEXT blocks, numbered by their index attribute.
+Each is a separate report from a different user: classify each one on its own
+content only, never using anything from another TEXT.
+Respond with a JSON array of exactly {n} objects, each following OUTPUT_FORMAT
+plus an "index" field set to the index of the TEXT it classifies.
+</BATCH>"""
+
+class BatchClassification(ClassificationResponse):
+    index: int
+
+_BATCH_LIST = TypeAdapter(List[BatchClassification])
+_batch_tasks: set = set()
+
+def classify_many(texts: List[str]) -> List[Optional[ClassificationResponse]]:
+    """
+    Classify several texts with a single Gemini call.
+    
+    Items are matched back to texts by their index, never by position;
+    texts whose index is missing or repeated in the reply come back as None.
+    """
+    blocks = "".join(
+        # A text must not be able to close its own block early
+        f'\n<TEXT index="{i}">\n{text.replace("</TEXT>", "</ TEXT>")}\n</TEXT>'
+        for i, text in enumerate(texts, 1)
+    )
+    reply = _generate(
+        blocks + PROMPT_SUFFIX + BATCH_INSTRUCTIONS.format(n=len(texts)),
+        List[BatchClassification],
+    )
+    by_index = {}
+    duplicates = set()
+    for item in _BATCH_LIST.validate_json(reply):
+        if item.index in by_index:
+            duplicates.add(item.index)
+        by_index[item.index] = ClassificationResponse.model_validate(item.model_dump(exclude={"index"}))
+    return [
+        None if i in duplicates else by_index.get(i)
+        for i in range(1, len(texts) + 1)
+    ]
+
+async def _classify_one(text: str) -> ClassificationResponse:
+    reply = await asyncio.to_thread(generate_classification, text)
+    return ClassificationResponse.model_validate_json(reply)
+
+async def _run_batch(batch: List[tuple]) -> None:
+    """Classify one collected batch and resolve each caller's future"""
+    texts = [text for text, _ in batch]
+    if len(batch) == 1:
+        try:
+            results = [await _classify_one(texts[0])]
+        except Exception as e:
+            results = [e]
+    else:
+        try:
+            results = await asyncio.to_thread(classify_many, texts)
+        except Exception as e:
+            # One bad batch reply must not fail every request in it
+            logger.warning(f"Batch classification failed ({e}), classifying {len(texts)} texts individually")
+            results = [None] * len(texts)
+        
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing and len(missing) < len(texts):
+            logger.warning(f"Batch reply missing or mismatched {len(missing)} of {len(texts)} indexes, classifying those individually")
+        retried = await asyncio.gather(*(_classify_one(texts[i]) for i in missing), return_exceptions=True)
+        for i, result in zip(missing, retried):
+            results[i] = result
+    
+    for (_, future), result in zip(batch, results):
+        if future.done():
+            continue
+        if isinstance(result, BaseException):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+async def _classify_batch_worker(queue: asyncio.Queue) -> None:
+    """Drain the queue into batches of up to BATCH_MAX_SIZE within BATCH_WINDOW_S"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + BATCH_WINDOW_S
+        while len(batch) < BATCH_MAX_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        # Gemini takes seconds; keep collecting the next batch meanwhile
+        task = asyncio.create_task(_run_batch(batch))
+        _batch_tasks.add(task)
+        task.add_done_callback(_batch_tasks.discard)
+
+# ============================================
+# KEYWORD PRE-CLASSIFIER
+# ============================================
+
+# Keyword guesses (see lexicon.py) at or above the minimum confidence skip Gemini
+FAST_CLASSIFY_ENABLED = os.getenv("FAST_CLASSIFY_ENABLED", "true").lower() == "true"
+FAST_CLASSIFY_MIN_CONFIDENCE = float(os.getenv("FAST_CLASSIFY_MIN_CONFIDENCE", "0.9"))
+
+def fast_classify(text: str) -> Optional[ClassificationResponse]:
+    """
+    Keyword guess for text, or None if it has to go to Gemini.
+    
+    Negated keywords are ignored. Any remaining safety keyword defers to
+    Gemini, since only it may decide a report is a (confirmed) safety
+    incident. Confidence is 0.9 only when a single category matches with at
+    least two distinct keywords; mixed or thin evidence scores lower.
+    """
+    hits = lexicon_hits(text)
+    if not hits or Category.SAFETY in hits:
+        return None
+    
+    category, keywords = max(hits.items(), key=lambda item: len(item[1]))
+    if len(hits) > 1:
+        confidence = 0.5
+    elif len(keywords) >= 2:
+        confidence = 0.9
+    else:
+        confidence = 0.75
+    
+    return ClassificationResponse(
+        category=category,
+        priority=Priority.MEDIUM,
+        summary=lead_summary(text),
+        confidence=confidence,
+        suggested_department=CATEGORY_DEPARTMENT[category],
+        keywords=sorted(keywords),
+        reasoning=f"Keyword pre-classifier matched: {', '.join(sorted(keywords))}",
+        is_confirmed_incident=False,
+        requires_human_review=False,
+        safety_escalation_rationale=None,
+    )
+
+def from_semantic_hit(text: str, labels: dict) -> ClassificationResponse:
+    """
+    Response for text built from a near-duplicate report's cached labels.
+    
+    Only category, priority and department carry over; summary and keywords
+    come from this text, so nothing of the other ticket's wording leaks in.
+    """
+    keywords = sorted(set().union(*lexicon_hits(text).values()))
+    return ClassificationResponse(
+        **labels,
+        summary=lead_summary(text),
+        confidence=SEMANTIC_HIT_CONFIDENCE,
+        keywords=keywords,
+        reasoning="Labels reused from a near-identical earlier report",
+        is_confirmed_incident=False,
+        requires_human_review=False,
+        safety_escalation_rationale=None,
+    )
+
 @app.post("/classify", response_model=ClassificationResponse)
 async def classify_ticket(request: ClassificationRequest):
     """
@@ -167,30 +453,47 @@ async def classify_ticket(request: ClassificationRequest):
     try:
         logger.info(f"Classifying text for user: {request.user_id}")
         
-        # Prepare the prompt
-        system_context = "You are a workplace safety and quality expert."
-        full_prompt = system_context + "\n\n" + CLASSIFICATION_PROMPT.format(text=request.text)
+        text_key = hashlib.sha256(request.text.encode()).hexdigest()
+        cached = exact_cache.get(text_key)
+        if cached is not None:
+            exact_cache_stats["hits"] += 1
+            logger.info("Classification served from exact cache")
+            return cached
+        exact_cache_stats["misses"] += 1
         
-        # Call Gemini API
-        chat = client.chats.create(model="gemini-2.5-flash")
-        response = chat.send_message(full_prompt)
+        fast = fast_classify(request.text) if FAST_CLASSIFY_ENABLED else None
+        if fast is not None and fast.confidence >= FAST_CLASSIFY_MIN_CONFIDENCE:
+            logger.info(f"Classification served by keyword pre-classifier: {fast.category.value}")
+            return fast
         
-        # Parse response - extract JSON from markdown if needed
-        result = response.text.strip()
-        if result.startswith('```json'):
-            result = result[7:]
-        if result.startswith('```'):
-            result = result[3:]
-        if result.endswith('```'):
-            result = result[:-3]
+        vec = await embed_text(request.text)
+        if vec is not None:
+            labels = semantic_cache.get(vec)
+            if labels is not None:
+                logger.info("Classification served from semantic cache")
+                return from_semantic_hit(request.text, labels)
         
-        classification = json.loads(result.strip())
+        # Call Gemini API through the micro-batcher (static prefix served from the
+        # context cache when available; structured output guarantees bare JSON)
+        future = asyncio.get_running_loop().create_future()
+        await app.state.classify_queue.put((request.text, future))
+        response = await future
         
-        logger.info(f"Classification result: {classification['category']} - {classification['priority']}")
+        logger.info(f"Classification result: {response.category.value} - {response.priority.value}")
+        if fast is not None and fast.category != response.category:
+            # Feed for tuning CATEGORY_LEXICON
+            logger.info(
+                f"Pre-classifier disagreement: keywords={fast.category.value} "
+                f"({', '.join(fast.keywords)}), gemini={response.category.value}"
+            )
         
-        return ClassificationResponse(**classification)
+        exact_cache[text_key] = response
+        # Safety calls (and incident confirmation) are always Gemini's, per text
+        if vec is not None and response.category != Category.SAFETY:
+            semantic_cache.set(vec, response.model_dump(include={"category", "priority", "suggested_department"}))
+        return response
         
-    except json.JSONDecodeError as e:
+    except ValidationError as e:
         logger.error(f"Failed to parse Gemini response: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to parse classification response: {str(e)}")
     except Exception as e:
@@ -207,6 +510,23 @@ async def health_check():
         "llm_available": bool(GEMINI_API_KEY)
     }
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters for the exact and semantic classification caches"""
+    return {
+        "exact": {"entries": len(exact_cache), **exact_cache_stats},
+        "semantic": semantic_cache.stats(),
+    }
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    # Caches and micro-batch queues are per process; scale out with WEB_CONCURRENCY
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8001,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+    )
\ No newline at end of file
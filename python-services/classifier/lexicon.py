@@ -0,0 +1,107 @@
+# python-services/classifier/lexicon.py
+"""
+SmartClaim Keyword Lexicon
+Bilingual category keywords and the negation-aware matcher behind the
+classifier's keyword pre-classifier. Pure regex, no Gemini dependency.
+"""
+
+from typing import Dict, Set
+from enum import Enum
+import re
+
+
+class Category(str, Enum):
+    SAFETY = "safety"
+    QUALITY = "quality"
+    MAINTENANCE = "maintenance"
+    LOGISTICS = "logistics"
+    HR = "hr"
+    OTHER = "other"
+
+
+# Bilingual keywords per category. An entry ending in "*" is a stem and
+# matches any word it starts; other entries must match whole words.
+CATEGORY_LEXICON = {
+    # Safety keywords never produce an answer on their own; they only send
+    # the ticket to Gemini, which decides whether an incident is confirmed
+    Category.SAFETY: [
+        "injur*", "bleeding", "burned", "burnt", "on fire", "caught fire", "explosion*", "electrocut*",
+        "blessé*", "blessure*", "brûlé*", "brûlure*", "incendie*", "saign*", "électrocut*",
+    ],
+    Category.QUALITY: [
+        "defect*", "out of spec", "non-conform*", "nonconform*", "scrap", "scrapped", "rework*",
+        "défaut*", "défectu*", "hors tolérance", "rebut*", "retouche*",
+    ],
+    Category.MAINTENANCE: [
+        "breakdown*", "broken down", "malfunction*", "leak*", "abnormal noise", "vibrat*", "overheat*",
+        "panne*", "fuite*", "bruit anormal", "surchauffe*",
+    ],
+    Category.LOGISTICS: [
+        "stock", "stockout*", "out of stock", "inventory", "inventories", "delivery", "deliveries",
+        "delivered", "shipment*", "shortage*", "pallet*",
+        "livraison*", "inventaire*", "rupture de stock", "palette*", "expédition*",
+    ],
+    Category.HR: [
+        "absence*", "absenteeism", "harass*", "overtime", "timesheet*",
+        "harcèlement", "heures supplémentaires", "congé*",
+    ],
+}
+
+CATEGORY_DEPARTMENT = {
+    Category.SAFETY: "Safety & Security",
+    Category.QUALITY: "Quality Control",
+    Category.MAINTENANCE: "Maintenance",
+    Category.LOGISTICS: "Logistics",
+    Category.HR: "Human Resources",
+}
+
+def _keyword_pattern(entry: str) -> str:
+    if entry.endswith("*"):
+        return re.escape(entry[:-1]) + r"\w*"
+    return re.escape(entry) + r"\b"
+
+# One alternation over every category; the named group tells which category matched
+_LEXICON_RE = re.compile(
+    "|".join(
+        f"(?P<{category.value}>\\b(?:{'|'.join(map(_keyword_pattern, entries))}))"
+        for category, entries in CATEGORY_LEXICON.items()
+    ),
+    re.IGNORECASE,
+)
+
+# A keyword is negated when one of these words appears shortly before it in
+# the same clause ("no one was injured", "aucune fuite", "n'est pas blessé")
+_NEGATIONS = frozenset({
+    "no", "not", "never", "without", "none", "nobody", "neither", "nor",
+    "sans", "pas", "aucun", "aucune", "jamais", "ni", "personne",
+})
+_NEGATION_WINDOW = 4
+_CLAUSE_BREAK_RE = re.compile(r"[.,;:!?\n]|\b(?:but|mais)\b", re.IGNORECASE)
+_WORD_RE = re.compile(r"[\w']+")
+
+def is_negated(text: str, start: int) -> bool:
+    """Whether the keyword starting at text[start] follows a negation in its clause"""
+    clause = _CLAUSE_BREAK_RE.split(text[:start])[-1]
+    for word in _WORD_RE.findall(clause.lower())[-_NEGATION_WINDOW:]:
+        if word in _NEGATIONS or word.endswith("n't") or word.startswith("n'"):
+            return True
+    return False
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+SUMMARY_MAX_CHARS = 200
+
+def lead_summary(text: str) -> str:
+    """First sentence of text, shortened at a word boundary if still too long"""
+    text = " ".join(text.split())
+    summary = _SENTENCE_END_RE.split(text, maxsplit=1)[0]
+    if len(summary) > SUMMARY_MAX_CHARS:
+        summary = summary[:SUMMARY_MAX_CHARS].rsplit(" ", 1)[0].rstrip(",;:") + "…"
+    return summary
+
+def lexicon_hits(text: str) -> Dict[Category, Set[str]]:
+    """Distinct non-negated lexicon keywords in text, by category"""
+    hits: Dict[Category, Set[str]] = {}
+    for match in _LEXICON_RE.finditer(text):
+        if not is_negated(text, match.start()):
+            hits.setdefault(Category(match.lastgroup), set()).add(match.group().lower())
+    return hits
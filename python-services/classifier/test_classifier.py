@@ -0,0 +1,104 @@
+"""
+Unit tests for the keyword pre-classifier
+Run from this directory: python -m pytest test_classifier.py
+"""
+
+import os
+import sys
+
+import pytest
+
+from lexicon import Category, is_negated, lead_summary, lexicon_hits
+
+
+# ============================================
+# LEXICON (no Gemini dependency)
+# ============================================
+
+@pytest.mark.parametrize("text", [
+    "Operator injured his hand on the press",
+    "Un technicien a été blessé au bras près de la ligne 2",
+    "Small leak under the pump, and a worker got burned by the hot fluid",
+    "Fuite d'huile, un opérateur s'est brûlé la main",
+])
+def test_confirmed_injury_is_a_safety_hit(text):
+    assert Category.SAFETY in lexicon_hits(text)
+
+
+@pytest.mark.parametrize("text, category", [
+    ("Oil leak under press 3, no one was injured", Category.MAINTENANCE),
+    ("Pompe en panne, personne n'a été blessé", Category.MAINTENANCE),
+    ("Pallet shortage at dock B without any injury", Category.LOGISTICS),
+    ("Batch scrapped after defects were found, nobody was hurt or injured", Category.QUALITY),
+])
+def test_negated_injury_is_ignored(text, category):
+    hits = lexicon_hits(text)
+    assert Category.SAFETY not in hits
+    assert category in hits
+
+
+def test_negation_does_not_cross_clauses():
+    # "no" belongs to the first clause; the injury is confirmed in the second
+    hits = lexicon_hits("No defects on the part, but the operator was injured")
+    assert set(hits) == {Category.SAFETY}
+
+
+def test_negation_window():
+    text = "no sign that anyone, after the inspection was injured"
+    assert not is_negated(text, text.index("injured"))
+    text = "nobody got injured"
+    assert is_negated(text, text.index("injured"))
+
+
+def test_negated_category_keyword_is_ignored():
+    assert lexicon_hits("Checked the valve, no leak found") == {}
+
+
+def test_whole_words_only():
+    # "stock" must not match inside "stockholm", nor "scrap" inside "scrapbook"
+    assert lexicon_hits("Meeting about the Stockholm scrapbook") == {}
+
+
+def test_stems_match_word_starts():
+    assert lexicon_hits("Leaking valve, overheating motor") == {
+        Category.MAINTENANCE: {"leaking", "overheating"}
+    }
+
+
+def test_lead_summary():
+    text = "Conveyor breakdown in hall C. " + "Details follow. " * 30
+    assert lead_summary(text) == "Conveyor breakdown in hall C."
+    long_sentence = "word " * 100
+    summary = lead_summary(long_sentence)
+    assert len(summary) <= 201 and summary.endswith("…")
+
+
+# ============================================
+# fast_classify (app imports google-genai)
+# ============================================
+
+@pytest.fixture(scope="module")
+def app():
+    pytest.importorskip("google.genai")
+    # app imports shared.semantic_cache from python-services/
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.setdefault("GEMINI_API_KEY", "test")  # required at import; never used here
+    import app
+    return app
+
+
+def test_safety_defers_to_gemini(app):
+    assert app.fast_classify("Operator injured his hand on the press") is None
+
+
+def test_negated_injury_keeps_fast_path(app):
+    result = app.fast_classify("Oil leak under press 3, no one was injured")
+    assert result.category == Category.MAINTENANCE
+    assert result.keywords == ["leak"]
+    assert result.is_confirmed_incident is False
+
+
+def test_confidence_reflects_evidence(app):
+    assert app.fast_classify("Pump leak and overheating on line 4").confidence == 0.9
+    assert app.fast_classify("Pump leak on line 4").confidence == 0.75
+    assert app.fast_classify("Pump leak next to the delayed delivery").confidence == 0.5
@@ -5,31 +5,85 @@ Supports: CSV, Excel, PDF, DOCX, PPT, MD, TXT
 Features: OCR for image-based documents using PaddleOCR
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional
+from fastapi.responses import ORJSONResponse
+from typing import BinaryIO, Optional, Union
 import pandas as pd
-import PyPDF2
 from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.ns import qn
 from pptx import Presentation
 import fitz  # PyMuPDF for better PDF handling and image extraction
+import filetype
+import anyio
+import asyncio
+import codecs
+import hashlib
 import io
+import shutil
 import os
+import threading
+import time
 import tempfile
 import logging
 from PIL import Image
+from concurrent.futures import Future, ThreadPoolExecutor
+from cachetools import TTLCache
+from charset_normalizer import from_bytes
 import numpy as np
 
+try:
+    import cv2  # installed with PaddleOCR; decodes JPEG/PNG faster than PIL
+except ImportError:
+    cv2 = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # ============== SINGLETON OCR MODEL ==============
+# The angle classifier only helps with rotated scans and costs memory and a
+# pass per text box; set OCR_ANGLE_CLS=1 if uploads are often upside down
+OCR_ANGLE_CLS = os.getenv("OCR_ANGLE_CLS", "0") == "1"
+# Concurrent OCR calls (see ocr_pool) and the CPU threads each one may use
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+OCR_CPU_THREADS = int(os.getenv("OCR_CPU_THREADS", str(max(1, (os.cpu_count() or 1) // OCR_WORKERS))))
+# oneDNN (MKL-DNN) kernels: PaddleOCR 2.x's accelerated CPU backend
+OCR_MKLDNN = os.getenv("OCR_MKLDNN", "1") == "1"
+# INT8-quantized ("slim") det/rec inference models, mounted at these paths;
+# the rec model must match the OCR language. oneDNN runs them with INT8 kernels
+OCR_QUANTIZED = os.getenv("OCR_QUANTIZED", "0") == "1"
+OCR_DET_MODEL_DIR = os.getenv("OCR_DET_MODEL_DIR", "/app/models/paddleocr/det")
+OCR_REC_MODEL_DIR = os.getenv("OCR_REC_MODEL_DIR", "/app/models/paddleocr/rec")
+# Seconds to wait after a failed model load before the next image tries again
+OCR_INIT_RETRY_S = float(os.getenv("OCR_INIT_RETRY_S", "60"))
+# What perform_ocr returns in place of text when OCR could not run
+OCR_UNAVAILABLE = "[OCR not available]"
+OCR_ERROR_PREFIX = "[OCR error"
+# On GPU hosts let cuDNN benchmark convolution algorithms once per shape;
+# paddle reads these flags when it is first imported
+os.environ.setdefault("FLAGS_cudnn_exhaustive_search", "1")
+os.environ.setdefault("FLAGS_conv_workspace_size_limit", "512")
+
+
+def cuda_available() -> bool:
+    """Whether paddle was built with CUDA and can see a GPU"""
+    try:
+        import paddle
+        return paddle.device.is_compiled_with_cuda() and paddle.device.cuda.device_count() > 0
+    except Exception:
+        return False
+
+
 class OCREngine:
     """Singleton class for PaddleOCR to avoid re-initialization"""
     _instance = None
     _reader = None
     _initialized = False
+    _failed_at = None  # time.monotonic() of the last failed load
+    failures = 0  # perform_ocr calls that returned a failure marker
+    _init_lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
@@ -38,26 +92,48 @@ class OCREngine:
     
     def get_reader(self, languages: list = ['en', 'fr']):
         """Get or initialize the PaddleOCR reader"""
-        if not self._initialized:
-            try:
-                from paddleocr import PaddleOCR
-                logger.info("🔄 Initializing PaddleOCR model (first time only)...")
-                # PaddleOCR supports: en, fr, german, korean, japan, chinese, etc.
-                # Use 'en' for English, 'fr' for French, 'ch' for Chinese
-                lang = 'fr' if 'fr' in languages else 'en'
-                self._reader = PaddleOCR(
-                    use_angle_cls=True,  # Detect rotated text
-                    lang=lang,
-                    use_gpu=False,  # CPU mode
-                    show_log=False,  # Reduce log spam
-                )
-                self._initialized = True
-                logger.info(f"✅ PaddleOCR initialized successfully (lang={lang})")
-            except Exception as e:
-                logger.error(f"❌ Failed to initialize PaddleOCR: {e}")
-                self._reader = None
+        if not self._initialized and not self._backing_off():
+            # Extractors run in worker threads; only one of them may load the model
+            with self._init_lock:
+                if not self._initialized and not self._backing_off():
+                    try:
+                        from paddleocr import PaddleOCR
+                        logger.info("🔄 Initializing PaddleOCR model (first time only)...")
+                        # PaddleOCR supports: en, fr, german, korean, japan, chinese, etc.
+                        # Use 'en' for English, 'fr' for French, 'ch' for Chinese
+                        lang = 'fr' if 'fr' in languages else 'en'
+                        use_gpu = cuda_available()
+                        model_dirs = {}
+                        if OCR_QUANTIZED:
+                            model_dirs = {"det_model_dir": OCR_DET_MODEL_DIR, "rec_model_dir": OCR_REC_MODEL_DIR}
+                        self._reader = PaddleOCR(
+                            use_angle_cls=OCR_ANGLE_CLS,  # Detect rotated text
+                            # Batching gives no speedup on CPU but sizes the
+                            # inference arenas for six crops at a time
+                            rec_batch_num=1,
+                            cls_batch_num=1,
+                            lang=lang,
+                            use_gpu=use_gpu,
+                            enable_mkldnn=OCR_MKLDNN and not use_gpu,
+                            cpu_threads=OCR_CPU_THREADS,
+                            show_log=False,  # Reduce log spam
+                            **model_dirs,
+                        )
+                        self._initialized = True
+                        self._failed_at = None
+                        logger.info(f"✅ PaddleOCR initialized successfully (lang={lang}, gpu={use_gpu}, quantized={OCR_QUANTIZED})")
+                    except Exception as e:
+                        logger.error(f"❌ Failed to initialize PaddleOCR: {e}")
+                        self._reader = None
+                        # Don't retry the import and model load for every image,
+                        # but do try again once OCR_INIT_RETRY_S has passed
+                        self._failed_at = time.monotonic()
         return self._reader
     
+    def _backing_off(self) -> bool:
+        """Whether the last failed load was less than OCR_INIT_RETRY_S ago"""
+        return self._failed_at is not None and time.monotonic() - self._failed_at < OCR_INIT_RETRY_S
+    
     @property
     def is_available(self):
         return self._initialized and self._reader is not None
@@ -70,9 +146,25 @@ ocr_engine = OCREngine()
 app = FastAPI(
     title="SmartClaim File Extractor",
     description="Extract text from various file formats with OCR support",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse,
 )
 
+# Largest request body accepted; checked against Content-Length before the
+# upload is received (uploads only reach the handlers once fully spooled)
+MAX_UPLOAD_MB = int(os.getenv("MAX_UPLOAD_MB", "100"))
+
+
+# Registered before CORS so CORS stays outermost and the 413 keeps its headers
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """Refuse bodies declared larger than MAX_UPLOAD_MB without reading them"""
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > MAX_UPLOAD_MB * 1024 * 1024:
+        return ORJSONResponse(status_code=413, content={"detail": f"Upload exceeds {MAX_UPLOAD_MB} MB limit"})
+    return await call_next(request)
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -82,59 +174,144 @@ app.add_middleware(
 )
 
 
-def perform_ocr(image_bytes: bytes) -> str:
-    """Perform OCR on image bytes using PaddleOCR"""
+# Recognized lines below this confidence are dropped
+OCR_MIN_CONFIDENCE = float(os.getenv("OCR_MIN_CONF", "0.5"))
+
+
+def ocr_lines(results) -> list:
+    """
+    Confident text lines from a PaddleOCR result for one image.
+    
+    PaddleOCR 2.x returns [[box, (text, confidence)], ...] per image;
+    3.x returns a dict-like result with parallel rec_texts/rec_scores.
+    """
+    if not results or not results[0]:
+        return []
+    page = results[0]
+    if hasattr(page, "get"):
+        pairs = zip(page.get("rec_texts", ()), page.get("rec_scores", ()))
+    else:
+        pairs = (line[1] for line in page)
+    return [text for text, confidence in pairs if confidence > OCR_MIN_CONFIDENCE]
+
+
+def rgb_to_bgr(image_np: np.ndarray) -> np.ndarray:
+    """Reorder an RGB array (PIL, PyMuPDF) to the BGR layout OpenCV and PaddleOCR use"""
+    return np.ascontiguousarray(image_np[:, :, ::-1])
+
+
+def decode_image(image_bytes: bytes) -> np.ndarray:
+    """Decode an image to a 3-channel BGR array: OpenCV when it can, PIL for the rest (e.g. GIF)"""
+    if cv2 is not None:
+        image_np = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image_np is not None:
+            return image_np
+    image = Image.open(io.BytesIO(image_bytes))
+    if image.mode != "RGB":
+        image = image.convert("RGB")  # convert copies, so only when needed
+    return rgb_to_bgr(np.asarray(image))
+
+
+def perform_ocr(image: Union[bytes, np.ndarray]) -> str:
+    """Perform OCR with PaddleOCR on encoded image bytes or an already decoded BGR array"""
     reader = ocr_engine.get_reader()
     if not reader:
-        return "[OCR not available]"
+        ocr_engine.failures += 1
+        return OCR_UNAVAILABLE
     
     try:
-        # Convert bytes to numpy array for PaddleOCR
-        image = Image.open(io.BytesIO(image_bytes))
-        image_np = np.array(image.convert('RGB'))
+        image_np = decode_image(image) if isinstance(image, bytes) else image
         
-        # Perform OCR - PaddleOCR returns list of [box, (text, confidence)]
-        results = reader.ocr(image_np, cls=True)
-        
-        # Extract text from results
-        if results and results[0]:
-            text_lines = [line[1][0] for line in results[0] if line[1][1] > 0.5]  # Filter by confidence
-            return "\n".join(text_lines)
-        return ""
+        results = reader.ocr(image_np, cls=OCR_ANGLE_CLS)
+        return "\n".join(ocr_lines(results))
     except Exception as e:
         logger.error(f"OCR failed: {e}")
-        return f"[OCR error: {str(e)}]"
+        ocr_engine.failures += 1
+        return f"{OCR_ERROR_PREFIX}: {str(e)}]"
 
 
-def perform_ocr_on_image(image: Image.Image) -> str:
-    """Perform OCR on PIL Image using PaddleOCR"""
-    reader = ocr_engine.get_reader()
-    if not reader:
-        return "[OCR not available]"
-    
+def read_csv_fast(file_obj: BinaryIO) -> pd.DataFrame:
+    """Parse CSV with the multithreaded pyarrow engine, falling back to pandas' C parser"""
     try:
-        image_np = np.array(image.convert('RGB'))
-        
-        # Perform OCR - PaddleOCR returns list of [box, (text, confidence)]
-        results = reader.ocr(image_np, cls=True)
-        
-        # Extract text from results
-        if results and results[0]:
-            text_lines = [line[1][0] for line in results[0] if line[1][1] > 0.5]  # Filter by confidence
-            return "\n".join(text_lines)
-        return ""
+        return pd.read_csv(file_obj, engine="pyarrow")
     except Exception as e:
-        logger.error(f"OCR failed: {e}")
-        return f"[OCR error: {str(e)}]"
+        # pyarrow is stricter (e.g. ragged rows); the default parser is more forgiving
+        logger.info(f"pyarrow CSV parse failed ({e}), retrying with default engine")
+        file_obj.seek(0)
+        return pd.read_csv(file_obj)
+
+
+def read_excel_sheets(file_obj: BinaryIO) -> dict:
+    """Parse every sheet in one pass with the Rust-based calamine reader (also handles .xls), falling back to pandas' default engine"""
+    try:
+        return pd.read_excel(file_obj, sheet_name=None, engine="calamine")
+    except ImportError as e:
+        logger.info(f"calamine unavailable ({e}), reading workbook with default engine")
+        file_obj.seek(0)
+        return pd.read_excel(file_obj, sheet_name=None)
+
+
+# OCR of scanned pages and embedded images runs on a bounded pool shared by
+# all requests; PaddleOCR's native inference releases the GIL. Extractors
+# submit every image of a document before waiting on any result
+ocr_pool = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix="ocr")
+
+# Embedded images smaller than this on both sides are icons/bullets, not text
+MIN_OCR_IMAGE_SIDE = 64
+
+
+def submit_image_ocr(image_bytes: bytes, queued: dict) -> Optional[Future]:
+    """
+    Queue OCR for an image embedded in a document.
+    
+    queued maps content digests to jobs for the current document, so a logo
+    repeated on every slide is recognized once. Returns None for icons.
+    """
+    key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+    if key not in queued:
+        try:
+            width, height = Image.open(io.BytesIO(image_bytes)).size  # header only
+            is_icon = width < MIN_OCR_IMAGE_SIDE and height < MIN_OCR_IMAGE_SIDE
+        except Exception:
+            is_icon = False  # let OCR report formats PIL can't size
+        queued[key] = None if is_icon else ocr_pool.submit(perform_ocr, image_bytes)
+    return queued[key]
+
+
+# Rows of each table sent downstream unless the caller asks for the full dump:
+# the first TABLE_SAMPLE_ROWS and last TABLE_TAIL_ROWS, plus column statistics
+TABLE_SAMPLE_ROWS = int(os.getenv("TABLE_SAMPLE_ROWS", "50"))
+TABLE_TAIL_ROWS = int(os.getenv("TABLE_TAIL_ROWS", "20"))
 
 
-def extract_from_csv(file_content: bytes, user_context: str = "") -> dict:
+def table_text(df: pd.DataFrame, full: bool = False) -> str:
+    """
+    Render a table for the LLM.
+    
+    Tables longer than the head and tail samples are summarized as column
+    types, the first and last rows and describe() statistics, which keeps
+    prompts small for large spreadsheets; full=True renders every row.
+    """
+    if full or len(df) <= TABLE_SAMPLE_ROWS + TABLE_TAIL_ROWS:
+        return df.to_csv(index=False).rstrip("\n")
+    buf = io.StringIO()
+    buf.write("Dtypes: " + ", ".join(f"{col}: {dtype}" for col, dtype in df.dtypes.items()) + "\n")
+    buf.write(f"First {TABLE_SAMPLE_ROWS} of {len(df)} rows:\n")
+    df.head(TABLE_SAMPLE_ROWS).to_csv(buf, index=False)
+    buf.write(f"Last {TABLE_TAIL_ROWS} rows:\n")
+    df.tail(TABLE_TAIL_ROWS).to_csv(buf, index=False)
+    buf.write("Column statistics:\n")
+    df.describe(include="all").to_csv(buf)
+    return buf.getvalue().rstrip("\n")
+
+
+def extract_from_csv(file_obj: BinaryIO, user_context: str = "", full: bool = False) -> dict:
     """Extract text from CSV file with analysis context"""
     try:
-        df = pd.read_csv(io.BytesIO(file_content))
+        df = read_csv_fast(file_obj)
         
-        # Generate table summary
-        table_text = df.to_string()
+        # Generate table summary (CSV text: far cheaper than to_string's padded layout)
+        table = table_text(df, full)
         
         # Add analysis context for LLM
         analysis_prompt = f"""
@@ -145,7 +322,7 @@ Number of columns: {len(df.columns)}
 Columns: {', '.join(df.columns.tolist())}
 
 --- TABLE DATA ---
-{table_text}
+{table}
 
 --- ANALYSIS INSTRUCTIONS ---
 Please analyze this data for any potential issues, anomalies, or problems that may be relevant to the user's claim or complaint.
@@ -156,24 +333,24 @@ Please analyze this data for any potential issues, anomalies, or problems that m
         raise HTTPException(status_code=400, detail=f"CSV parsing error: {str(e)}")
 
 
-def extract_from_excel(file_content: bytes, user_context: str = "") -> dict:
+def extract_from_excel(file_obj: BinaryIO, user_context: str = "", full: bool = False) -> dict:
     """Extract text from Excel file with all sheets and analysis context"""
     try:
-        # Read all sheets
-        excel_file = pd.ExcelFile(io.BytesIO(file_content))
+        sheets = read_excel_sheets(file_obj)
+        sheet_names = list(sheets)
         all_sheets_text = []
         total_rows = 0
         total_cols = 0
         
-        for sheet_name in excel_file.sheet_names:
-            df = pd.read_excel(excel_file, sheet_name=sheet_name)
+        for sheet_name, df in sheets.items():
             total_rows += len(df)
             total_cols = max(total_cols, len(df.columns))
             
-            sheet_text = f"\n=== Sheet: {sheet_name} ===\n"
-            sheet_text += f"Columns: {', '.join(df.columns.astype(str).tolist())}\n"
-            sheet_text += df.to_string()
-            all_sheets_text.append(sheet_text)
+            all_sheets_text.append(
+                f"\n=== Sheet: {sheet_name} ===\n"
+                f"Columns: {', '.join(df.columns.astype(str).tolist())}\n"
+                f"{table_text(df, full)}"
+            )
         
         combined_text = "\n".join(all_sheets_text)
         
@@ -181,8 +358,8 @@ def extract_from_excel(file_content: bytes, user_context: str = "") -> dict:
         analysis_prompt = f"""
 === EXCEL DATA ANALYSIS ===
 The following data was extracted from an uploaded Excel file.
-Number of sheets: {len(excel_file.sheet_names)}
-Sheet names: {', '.join(excel_file.sheet_names)}
+Number of sheets: {len(sheet_names)}
+Sheet names: {', '.join(map(str, sheet_names))}
 Total rows across all sheets: {total_rows}
 
 --- SPREADSHEET DATA ---
@@ -196,83 +373,236 @@ Please analyze this spreadsheet data carefully for:
 4. Any patterns that might indicate problems
 {f"User context for this analysis: {user_context}" if user_context else ""}
 """
-        return {"text": analysis_prompt, "is_tabular": True, "rows": total_rows, "sheets": len(excel_file.sheet_names)}
+        return {"text": analysis_prompt, "is_tabular": True, "rows": total_rows, "sheets": len(sheet_names)}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Excel parsing error: {str(e)}")
 
 
-def extract_from_pdf(file_content: bytes) -> dict:
+# Longest side, in pixels, of a page rendered for OCR
+PDF_OCR_TARGET_SIDE = int(os.getenv("PDF_OCR_TARGET_SIDE", "1800"))
+
+
+def ocr_zoom(page) -> float:
+    """
+    Render scale for OCRing a page.
+    
+    Up to 2x for better OCR, but no more than needed for the longer side to
+    reach PDF_OCR_TARGET_SIDE pixels, so large-format pages don't feed the
+    detector millions of extra pixels; never below 1x, to keep small text legible.
+    """
+    rect = page.rect
+    return max(1.0, min(2.0, PDF_OCR_TARGET_SIDE / max(rect.width, rect.height, 1)))
+
+
+# Share of an image's area that text blocks must cover before the image is taken
+# to carry a text layer already; a page number or stamp on a scan covers far less
+PDF_OCR_TEXT_COVERAGE = float(os.getenv("PDF_OCR_TEXT_COVERAGE", "0.05"))
+
+
+def page_needs_ocr(page, textpage) -> bool:
+    """
+    Whether a page with little extractable text is worth rendering and OCRing.
+    
+    Rendering is skipped for truly blank pages and for pages whose images
+    already have text (e.g. a previously OCRed scan) over them: text blocks
+    must cover at least PDF_OCR_TEXT_COVERAGE of every image, so a footer or
+    page number on a scanned page does not count. The page's existing TextPage
+    is reused rather than re-parsing fonts per image.
+    """
+    images = page.get_images(full=True)
+    if not images:
+        # Without images, only vector drawings can hold text that get_text missed
+        return bool(page.get_drawings())
+    text_rects = [
+        fitz.Rect(block[:4])
+        for block in page.get_text("blocks", textpage=textpage)
+        if block[6] == 0 and block[4].strip()  # non-empty text blocks
+    ]
+    if not text_rects:
+        return True
+    for image in images:
+        for rect in page.get_image_rects(image[0]):
+            rect = rect & page.rect  # only the visible part
+            if rect.is_empty:
+                continue
+            covered = sum((rect & text_rect).get_area() for text_rect in text_rects)
+            if covered < PDF_OCR_TEXT_COVERAGE * rect.get_area():
+                return True
+    return False
+
+
+def open_pdf(file_obj: BinaryIO) -> fitz.Document:
+    """
+    Open an uploaded PDF with PyMuPDF.
+    
+    Small uploads are still in memory and are opened from their bytes. Larger
+    ones have been spooled to disk; they are copied to a named file in 1 MB
+    chunks and opened by path, so MuPDF reads pages on demand instead of
+    holding the whole file in RAM. The copy is unlinked once MuPDF has it
+    open.
+    """
+    if not getattr(file_obj, "_rolled", False):
+        return fitz.open(stream=file_obj.read(), filetype="pdf")
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+        shutil.copyfileobj(file_obj, tmp, 1 << 20)
+        tmp.flush()
+        return fitz.open(tmp.name, filetype="pdf")
+
+
+def extract_from_pdf(file_obj: BinaryIO) -> dict:
     """Extract text from PDF using PyMuPDF, with OCR fallback for image-based pages"""
     try:
-        doc = fitz.open(stream=file_content, filetype="pdf")
-        all_text = []
+        doc = open_pdf(file_obj)
+        pages = []  # (page_num, extracted text or None, pending OCR or None)
         ocr_used = False
         page_count = len(doc)  # Store page count before closing
         
+        # First pass: extract text and render image-based pages. OCR starts on
+        # the pool as soon as each page is rendered, overlapping the next render
         for page_num in range(page_count):
             page = doc[page_num]
-            page_text = page.get_text("text").strip()
+            # One TextPage per page: fonts and CMaps are parsed once and
+            # shared by the text extraction and the OCR probe below
+            textpage = page.get_textpage()
+            page_text = page.get_text("text", textpage=textpage).strip()
             
             # Check if page has meaningful text
             if len(page_text) > 50:
                 # Text-based page - use extracted text
-                all_text.append(f"\n--- Page {page_num + 1} ---\n{page_text}")
+                pages.append((page_num, page_text, None))
+            elif not page_needs_ocr(page, textpage):
+                # Blank page, or its images already carry a text layer
+                pages.append((page_num, page_text or "[No text detected]", None))
             else:
                 # Image-based page - use OCR
                 logger.info(f"[PDF] Page {page_num + 1} appears to be image-based, using OCR...")
                 ocr_used = True
                 
-                # Render page to image
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x zoom for better OCR
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                
-                ocr_text = perform_ocr_on_image(img)
-                if ocr_text:
-                    all_text.append(f"\n--- Page {page_num + 1} (OCR) ---\n{ocr_text}")
-                else:
-                    all_text.append(f"\n--- Page {page_num + 1} ---\n[No text detected]")
+                # Render page to RGB, reordered to BGR like decoded images; the
+                # array is a copy of the bitmap, so it outlives the document
+                zoom = ocr_zoom(page)
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csRGB, alpha=False)
+                image_np = rgb_to_bgr(np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, 3))
+                pages.append((page_num, None, ocr_pool.submit(perform_ocr, image_np)))
         
         doc.close()
         
+        # Second pass: collect OCR results in page order
+        all_text = []
+        for page_num, page_text, pending in pages:
+            if pending is None:
+                all_text.append(f"\n--- Page {page_num + 1} ---\n{page_text}")
+                continue
+            ocr_text = pending.result()
+            if ocr_text:
+                all_text.append(f"\n--- Page {page_num + 1} (OCR) ---\n{ocr_text}")
+            else:
+                all_text.append(f"\n--- Page {page_num + 1} ---\n[No text detected]")
+        
         final_text = "\n".join(all_text).strip()
         return {"text": final_text, "ocr_used": ocr_used, "pages": page_count}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"PDF parsing error: {str(e)}")
 
 
-def extract_from_docx(file_content: bytes) -> dict:
+# WordprocessingML tags for the single-pass DOCX walk
+W_P, W_TBL, W_TR, W_TC, W_R = qn("w:p"), qn("w:tbl"), qn("w:tr"), qn("w:tc"), qn("w:r")
+W_T, W_TAB, W_BR, W_CR = qn("w:t"), qn("w:tab"), qn("w:br"), qn("w:cr")
+W_PTAB, W_NOBREAKHYPHEN, W_HYPERLINK, W_TYPE = qn("w:ptab"), qn("w:noBreakHyphen"), qn("w:hyperlink"), qn("w:type")
+W_TCPR, W_GRIDSPAN, W_VMERGE, W_VAL = qn("w:tcPr"), qn("w:gridSpan"), qn("w:vMerge"), qn("w:val")
+_RUN_BREAKS = {W_TAB: "\t", W_PTAB: "\t", W_CR: "\n", W_NOBREAKHYPHEN: "-"}
+
+
+def docx_run_text(run) -> str:
+    """Text of a w:r element, matching python-docx's Run.text"""
+    parts = []
+    for el in run:
+        if el.tag == W_T:
+            parts.append(el.text or "")
+        elif el.tag == W_BR:
+            # Page and column breaks have no text equivalent
+            if el.get(W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            parts.append(_RUN_BREAKS.get(el.tag, ""))
+    return "".join(parts)
+
+
+def docx_paragraph_text(p) -> str:
+    """
+    Text of a w:p element, matching python-docx's Paragraph.text.
+    
+    Only the paragraph's own runs and those of its hyperlinks are read; runs
+    nested deeper (text boxes, mc:AlternateContent fallbacks) belong to other
+    paragraphs and would otherwise be duplicated.
+    """
+    parts = []
+    for child in p:
+        if child.tag == W_R:
+            parts.append(docx_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(docx_run_text(run) for run in child if run.tag == W_R)
+    return "".join(parts)
+
+
+def docx_table_rows(tbl) -> list:
+    """' | '-joined rows of a w:tbl element, repeating merged cells like python-docx's row.cells"""
+    rows, above = [], []
+    for tr in tbl.iterchildren(W_TR):
+        cells = []
+        for tc in tr.iterchildren(W_TC):
+            tc_pr = tc.find(W_TCPR)
+            grid_span = tc_pr.find(W_GRIDSPAN) if tc_pr is not None else None
+            v_merge = tc_pr.find(W_VMERGE) if tc_pr is not None else None
+            span = int(grid_span.get(W_VAL)) if grid_span is not None else 1
+            if v_merge is not None and v_merge.get(W_VAL, "continue") == "continue" and len(cells) < len(above):
+                text = above[len(cells)]  # continuation of the cell above
+            else:
+                text = "\n".join(docx_paragraph_text(p) for p in tc.iterchildren(W_P)).strip()
+            cells.extend([text] * span)
+        rows.append(" | ".join(cells))
+        above = cells
+    return rows
+
+
+def extract_from_docx(file_obj: BinaryIO) -> dict:
     """Extract text from DOCX file including tables and images"""
     try:
-        doc = Document(io.BytesIO(file_content))
+        doc = Document(file_obj)
         paragraphs = []
         tables_text = []
         images_text = []
         ocr_used = False
         
-        # Extract paragraphs
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                paragraphs.append(paragraph.text)
-        
-        # Extract tables
-        for table_idx, table in enumerate(doc.tables, 1):
-            table_rows = []
-            for row in table.rows:
-                row_text = [cell.text.strip() for cell in row.cells]
-                table_rows.append(" | ".join(row_text))
-            tables_text.append(f"\n--- Table {table_idx} ---\n" + "\n".join(table_rows))
+        # Extract body paragraphs and tables in one walk over the XML,
+        # without building python-docx Paragraph/Table/Cell wrappers
+        for node in doc.element.body.iterchildren(W_P, W_TBL):
+            if node.tag == W_P:
+                text = docx_paragraph_text(node)
+                if text.strip():
+                    paragraphs.append(text)
+            else:
+                table_rows = docx_table_rows(node)
+                tables_text.append(f"\n--- Table {len(tables_text) + 1} ---\n" + "\n".join(table_rows))
         
-        # Extract images and OCR them
+        # Extract images and OCR them concurrently
+        pending = []
+        queued = {}
+        # python-docx has already read every part out of the ZIP, so blobs are in memory;
+        # linked (external) images have no blob to read
         for rel in doc.part.rels.values():
-            if "image" in rel.target_ref:
+            if rel.reltype == RT.IMAGE and not rel.is_external:
                 try:
-                    image_data = rel.target_part.blob
-                    ocr_text = perform_ocr(image_data)
-                    if ocr_text and ocr_text != "[OCR not available]":
-                        images_text.append(f"\n--- Image (OCR) ---\n{ocr_text}")
-                        ocr_used = True
+                    future = submit_image_ocr(rel.target_part.blob, queued)
+                    if future is not None:
+                        pending.append(future)
                 except Exception as e:
                     logger.warning(f"Could not process image in DOCX: {e}")
+        for future in pending:
+            ocr_text = future.result()
+            if ocr_text and ocr_text != OCR_UNAVAILABLE:
+                images_text.append(f"\n--- Image (OCR) ---\n{ocr_text}")
+                ocr_used = True
         
         # Combine all text
         full_text = "\n".join(paragraphs)
@@ -286,11 +616,12 @@ def extract_from_docx(file_content: bytes) -> dict:
         raise HTTPException(status_code=400, detail=f"DOCX parsing error: {str(e)}")
 
 
-def extract_from_pptx(file_content: bytes) -> dict:
+def extract_from_pptx(file_obj: BinaryIO) -> dict:
     """Extract text from PowerPoint including OCR for image slides"""
     try:
-        prs = Presentation(io.BytesIO(file_content))
-        all_text = []
+        prs = Presentation(file_obj)
+        slides = []  # (slide_num, parts); image parts are pending OCR futures
+        queued = {}
         ocr_used = False
         
         for slide_num, slide in enumerate(prs.slides, 1):
@@ -311,18 +642,29 @@ def extract_from_pptx(file_content: bytes) -> dict:
                         slide_text_parts.append(" | ".join(row_text))
                     has_text = True
                 
-                # OCR images in slides
+                # OCR images in slides (collected after every slide is queued)
                 if hasattr(shape, "image"):
                     try:
-                        image_bytes = shape.image.blob
-                        ocr_text = perform_ocr(image_bytes)
-                        if ocr_text and ocr_text not in ["[OCR not available]", ""]:
-                            slide_text_parts.append(f"[Image OCR]: {ocr_text}")
-                            ocr_used = True
+                        future = submit_image_ocr(shape.image.blob, queued)
+                        if future is not None:
+                            slide_text_parts.append(future)
                     except Exception as e:
                         logger.warning(f"Could not OCR image in slide {slide_num}: {e}")
             
-            slide_content = "\n".join(slide_text_parts) if slide_text_parts else "[No text content]"
+            slides.append((slide_num, slide_text_parts))
+        
+        all_text = []
+        for slide_num, slide_text_parts in slides:
+            parts = []
+            for part in slide_text_parts:
+                if isinstance(part, str):
+                    parts.append(part)
+                    continue
+                ocr_text = part.result()
+                if ocr_text and ocr_text not in [OCR_UNAVAILABLE, ""]:
+                    parts.append(f"[Image OCR]: {ocr_text}")
+                    ocr_used = True
+            slide_content = "\n".join(parts) if parts else "[No text content]"
             all_text.append(f"\n--- Slide {slide_num} ---\n{slide_content}")
         
         return {"text": "\n".join(all_text).strip(), "ocr_used": ocr_used, "slides": len(prs.slides)}
@@ -330,32 +672,164 @@ def extract_from_pptx(file_content: bytes) -> dict:
         raise HTTPException(status_code=400, detail=f"PPTX parsing error: {str(e)}")
 
 
-def extract_from_text(file_content: bytes) -> dict:
-    """Extract text from plain text or markdown files"""
+# Byte-order marks that identify the encoding outright (UTF-32 before UTF-16: its LE BOM starts with UTF-16's)
+TEXT_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Code page decode_text prefers when detection finds several equally likely
+WESTERN_CODEPAGE = "cp1252"
+
+
+def decode_text(file_content: bytes) -> str:
+    """Decode a text upload: BOM, then UTF-8, then charset detection, then Latin-1"""
+    for bom, encoding in TEXT_BOMS:
+        if file_content.startswith(bom):
+            return file_content.decode(encoding)
     try:
-        text = file_content.decode('utf-8')
-        return {"text": text}
+        return file_content.decode('utf-8')
     except UnicodeDecodeError:
-        try:
-            text = file_content.decode('latin-1')
-            return {"text": text}
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Text decoding error: {str(e)}")
+        pass
+    # Latin-1 accepts any bytes, so trying it first turned CP1252/GB18030 files into mojibake
+    matches = from_bytes(file_content)
+    best = matches.best()
+    if best is None:
+        return file_content.decode('latin-1')
+    # On short texts many single-byte code pages score alike and the detector
+    # may pick e.g. CP1250 for French; Western European text is the common
+    # legacy case here, so CP1252 wins when it scores as well as the best
+    for match in matches:
+        if (
+            WESTERN_CODEPAGE in match.could_be_from_charset
+            and match.chaos <= best.chaos
+            and match.coherence >= best.coherence
+        ):
+            return str(match)
+    return str(best)
+
+
+def extract_from_text(file_obj: BinaryIO) -> dict:
+    """Extract text from plain text or markdown files"""
+    try:
+        return {"text": decode_text(file_obj.read()).lstrip('\ufeff')}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Text decoding error: {str(e)}")
 
 
-def extract_from_image(file_content: bytes) -> dict:
+def extract_from_image(file_obj: BinaryIO) -> dict:
     """Extract text from standalone image files using OCR"""
     try:
-        ocr_text = perform_ocr(file_content)
+        ocr_text = perform_ocr(file_obj.read())
         return {"text": ocr_text, "ocr_used": True}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Image OCR error: {str(e)}")
 
 
+# ============== FORMAT DISPATCH ==============
+# kind -> (extractor, metadata format, whether it takes user_context)
+EXTRACTORS = {
+    "csv": (extract_from_csv, "csv", True),
+    "xls": (extract_from_excel, "excel", True),
+    "xlsx": (extract_from_excel, "excel", True),
+    "pdf": (extract_from_pdf, "pdf", False),
+    "doc": (extract_from_docx, "docx", False),
+    "docx": (extract_from_docx, "docx", False),
+    "ppt": (extract_from_pptx, "pptx", False),
+    "pptx": (extract_from_pptx, "pptx", False),
+    "txt": (extract_from_text, "text", False),
+    "md": (extract_from_text, "text", False),
+    "png": (extract_from_image, "image", False),
+    "jpg": (extract_from_image, "image", False),
+    "jpeg": (extract_from_image, "image", False),
+    "bmp": (extract_from_image, "image", False),
+    "tif": (extract_from_image, "image", False),
+    "tiff": (extract_from_image, "image", False),
+    "webp": (extract_from_image, "image", False),
+}
+
+
+def resolve_kind(file_obj: BinaryIO, file_name: str) -> Optional[str]:
+    """
+    Pick the EXTRACTORS key for an upload.
+    
+    Magic bytes win over the extension so mislabeled binaries are routed
+    correctly; text formats (CSV, TXT, MD) have no signature and fall back
+    to the extension.
+    """
+    head = file_obj.read(8192)
+    file_obj.seek(0)
+    kind = filetype.guess_extension(head)
+    if kind in EXTRACTORS:
+        return kind
+    ext = file_name.rsplit(".", 1)[-1] if "." in file_name else ""
+    return ext if ext in EXTRACTORS else None
+
+
+# ============== RESULT CACHE ==============
+# Re-uploads of the same file (e.g. one invoice attached to several claims)
+# are keyed by content hash, so renamed copies dedupe too
+extraction_cache: TTLCache = TTLCache(
+    maxsize=int(os.getenv("EXTRACTION_CACHE_SIZE", "5000")),
+    ttl=float(os.getenv("EXTRACTION_CACHE_TTL", "86400")),
+)
+_cache_lock = threading.Lock()
+
+
+def content_digest(file_obj: BinaryIO) -> str:
+    """BLAKE2b digest of the upload, read in 1 MB chunks"""
+    digest = hashlib.blake2b(digest_size=32)
+    for chunk in iter(lambda: file_obj.read(1 << 20), b""):
+        digest.update(chunk)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+
+def ocr_failed(text: str) -> bool:
+    """Whether extracted text holds a perform_ocr failure marker"""
+    return OCR_UNAVAILABLE in text or OCR_ERROR_PREFIX in text
+
+
+def extract_cached(kind: str, file_obj: BinaryIO, user_context: str = "", full: bool = False) -> dict:
+    """Run the extractor for kind, reusing the result for previously seen content"""
+    extractor, _, takes_context = EXTRACTORS[kind]
+    # Tabular prompts embed user_context and the sampling mode, so they are part of their key
+    key = (content_digest(file_obj), kind, (user_context, full) if takes_context else "")
+    with _cache_lock:
+        cached = extraction_cache.get(key)
+    if cached is not None:
+        logger.info(f"♻️ Extraction cache hit ({kind})")
+        return cached
+    
+    ocr_failures = ocr_engine.failures
+    result = extractor(file_obj, user_context, full) if takes_context else extractor(file_obj)
+    # DOCX/PPTX drop the unavailable marker, so also watch the failure count;
+    # a concurrent upload's failure only costs this one its cache entry
+    degraded = ocr_engine.failures != ocr_failures or ocr_failed(result.get("text", ""))
+    if degraded or result.get("error"):
+        # Not cached, so the upload is extracted again once OCR recovers
+        return result
+    with _cache_lock:
+        extraction_cache[key] = result
+    return result
+
+
+def upload_size(file_obj: BinaryIO) -> int:
+    """Size of an uploaded file, leaving it positioned at the start"""
+    file_obj.seek(0, io.SEEK_END)
+    size = file_obj.tell()
+    file_obj.seek(0)
+    return size
+
+
 @app.post("/extract")
 async def extract_text(
     file: UploadFile = File(...),
-    user_context: Optional[str] = Form(default="")
+    user_context: Optional[str] = Form(default=""),
+    full: bool = Form(default=False)
 ):
     """
     Extract text from uploaded file with intelligent OCR support
@@ -364,58 +838,38 @@ async def extract_text(
     
     Features:
     - Automatic OCR for image-based documents
-    - Multi-sheet Excel support with analysis context
+    - Multi-sheet Excel support with analysis context (sampled rows unless full=true)
     - Table extraction from Word/PowerPoint
     - Image extraction and OCR from embedded images
     """
-    file_content = await file.read()
+    # Parsers read the spooled upload directly instead of a second in-memory copy
+    file_obj = file.file
+    size_bytes = upload_size(file_obj)
     file_name = file.filename.lower() if file.filename else ""
     
-    logger.info(f"📥 Processing file: {file.filename} ({len(file_content)} bytes)")
+    logger.info(f"📥 Processing file: {file.filename} ({size_bytes} bytes)")
     
     result = {"text": "", "ocr_used": False}
     metadata = {
         "file_name": file.filename,
         "file_type": file.content_type,
-        "size_bytes": len(file_content)
+        "size_bytes": size_bytes
     }
     
     try:
-        # Determine file type and extract accordingly
-        if file_name.endswith('.csv'):
-            result = extract_from_csv(file_content, user_context)
-            metadata["format"] = "csv"
-            
-        elif file_name.endswith(('.xls', '.xlsx')):
-            result = extract_from_excel(file_content, user_context)
-            metadata["format"] = "excel"
-            
-        elif file_name.endswith('.pdf'):
-            result = extract_from_pdf(file_content)
-            metadata["format"] = "pdf"
-            
-        elif file_name.endswith(('.doc', '.docx')):
-            result = extract_from_docx(file_content)
-            metadata["format"] = "docx"
-            
-        elif file_name.endswith(('.ppt', '.pptx')):
-            result = extract_from_pptx(file_content)
-            metadata["format"] = "pptx"
-            
-        elif file_name.endswith(('.txt', '.md')):
-            result = extract_from_text(file_content)
-            metadata["format"] = "text"
-            
-        elif file_name.endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp')):
-            result = extract_from_image(file_content)
-            metadata["format"] = "image"
-            
-        else:
+        # Determine file type and extract accordingly. Parsing and OCR are
+        # blocking native calls, so they run in a worker thread to keep the
+        # event loop serving other requests
+        kind = resolve_kind(file_obj, file_name)
+        if kind is None:
             raise HTTPException(
                 status_code=400, 
                 detail=f"Unsupported file type: {file_name}. Supported: CSV, Excel, PDF, DOCX, PPTX, TXT, MD, Images"
             )
         
+        metadata["format"] = EXTRACTORS[kind][1]
+        result = await asyncio.to_thread(extract_cached, kind, file_obj, user_context, full)
+        
         text = result.get("text", "")
         metadata["extracted_length"] = len(text)
         metadata["word_count"] = len(text.split())
@@ -441,6 +895,10 @@ async def extract_text(
         raise HTTPException(status_code=500, detail=f"Extraction error: {str(e)}")
 
 
+# Files of one /extract-multiple request parsed at the same time
+MULTI_FILE_CONCURRENCY = int(os.getenv("MULTI_FILE_CONCURRENCY", "4"))
+
+
 @app.post("/extract-multiple")
 async def extract_multiple_files(files: list[UploadFile] = File(...)):
     """
@@ -448,56 +906,50 @@ async def extract_multiple_files(files: list[UploadFile] = File(...)):
     
     Returns combined text from all files with clear separators
     """
+    async def extract_one(file: UploadFile) -> dict:
+        file_obj = file.file
+        file_obj.seek(0)
+        file_name = file.filename.lower() if file.filename else ""
+        
+        logger.info(f"📥 Processing: {file.filename}")
+        
+        kind = resolve_kind(file_obj, file_name)
+        if kind is None:
+            return {"text": f"[Unsupported file type: {file_name}]", "ocr_used": False}
+        async with slots:
+            return await asyncio.to_thread(extract_cached, kind, file_obj)
+    
+    # Files are extracted concurrently so their OCR work shares the pool; the
+    # semaphore keeps a large batch from taking every default-executor thread
+    slots = asyncio.Semaphore(MULTI_FILE_CONCURRENCY)
+    outcomes = await asyncio.gather(*(extract_one(file) for file in files), return_exceptions=True)
+    
     all_results = []
     combined_text = []
     total_words = 0
     
-    for file in files:
-        try:
-            file_content = await file.read()
-            file_name = file.filename.lower() if file.filename else ""
-            
-            logger.info(f"📥 Processing: {file.filename}")
-            
-            result = {"text": "", "ocr_used": False}
-            
-            if file_name.endswith('.csv'):
-                result = extract_from_csv(file_content)
-            elif file_name.endswith(('.xls', '.xlsx')):
-                result = extract_from_excel(file_content)
-            elif file_name.endswith('.pdf'):
-                result = extract_from_pdf(file_content)
-            elif file_name.endswith(('.doc', '.docx')):
-                result = extract_from_docx(file_content)
-            elif file_name.endswith(('.ppt', '.pptx')):
-                result = extract_from_pptx(file_content)
-            elif file_name.endswith(('.txt', '.md')):
-                result = extract_from_text(file_content)
-            elif file_name.endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp')):
-                result = extract_from_image(file_content)
-            else:
-                result = {"text": f"[Unsupported file type: {file_name}]", "ocr_used": False}
-            
-            text = result.get("text", "")
-            word_count = len(text.split())
-            total_words += word_count
-            
-            all_results.append({
-                "file_name": file.filename,
-                "word_count": word_count,
-                "ocr_used": result.get("ocr_used", False),
-                "success": True
-            })
-            
-            combined_text.append(f"\n\n{'='*60}\n=== FILE: {file.filename} ===\n{'='*60}\n\n{text}")
-            
-        except Exception as e:
-            logger.error(f"Error processing {file.filename}: {e}")
+    for file, result in zip(files, outcomes):
+        if isinstance(result, Exception):
+            logger.error(f"Error processing {file.filename}: {result}")
             all_results.append({
                 "file_name": file.filename,
                 "success": False,
-                "error": str(e)
+                "error": str(result)
             })
+            continue
+        
+        text = result.get("text", "")
+        word_count = len(text.split())
+        total_words += word_count
+        
+        all_results.append({
+            "file_name": file.filename,
+            "word_count": word_count,
+            "ocr_used": result.get("ocr_used", False),
+            "success": True
+        })
+        
+        combined_text.append(f"\n\n{'='*60}\n=== FILE: {file.filename} ===\n{'='*60}\n\n{text}")
     
     return {
         "success": True,
@@ -535,14 +987,52 @@ async def root():
     }
 
 
+# Load the OCR model and run it on a blank image at startup, so the first
+# upload does not pay for weight loading and arena/kernel setup
+OCR_WARMUP = os.getenv("OCR_WARMUP", "1") == "1"
+
+
+def warm_up_ocr() -> None:
+    """Initialize PaddleOCR and run two dummy inferences"""
+    start = time.perf_counter()
+    reader = ocr_engine.get_reader()
+    if not reader:
+        return
+    try:
+        blank = np.zeros((640, 640, 3), dtype=np.uint8)
+        for _ in range(2):  # the first call still selects kernels
+            reader.ocr(blank, cls=OCR_ANGLE_CLS)
+        logger.info(f"🔥 OCR warm-up done in {time.perf_counter() - start:.1f}s")
+    except Exception as e:
+        logger.warning(f"OCR warm-up failed: {e}")
+
+
+# Threads for blocking parse work (asyncio.to_thread) and Starlette's upload
+# spooling; extractions mostly wait on I/O or the OCR pool, so allow 2 per core
+EXTRACT_THREADS = int(os.getenv("EXTRACT_THREADS", str(max(4, (os.cpu_count() or 1) * 2))))
+
+
 @app.on_event("startup")
 async def startup_event():
     """Pre-initialize OCR on startup for faster first request"""
     logger.info("🚀 Starting file extractor service...")
-    # Optionally pre-initialize OCR (comment out if you want lazy loading)
-    # ocr_engine.get_reader()
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=EXTRACT_THREADS, thread_name_prefix="extract")
+    )
+    anyio.to_thread.current_default_thread_limiter().total_tokens = EXTRACT_THREADS
+    if OCR_WARMUP:
+        await asyncio.to_thread(warm_up_ocr)
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Each worker loads its own OCR model and result cache; scale out with WEB_CONCURRENCY
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+    )
\ No newline at end of file
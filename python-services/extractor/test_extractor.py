@@ -0,0 +1,145 @@
+"""
+Unit tests for the extractor's text and image decoding, DOCX paragraph walk and PDF OCR triage
+Run from this directory: python -m pytest test_extractor.py
+"""
+
+import codecs
+import io
+
+import pytest
+from PIL import Image
+
+docx = pytest.importorskip("docx")
+from docx.oxml import parse_xml
+from docx.text.paragraph import Paragraph
+
+from app import decode_image, decode_text, docx_paragraph_text, fitz, page_needs_ocr
+
+
+# ============== decode_text ==============
+
+TEXT = "Fuite d'huile près de la presse n°3 — café renversé"
+
+
+@pytest.mark.parametrize("bom, encoding", [
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+])
+def test_decode_with_bom(bom, encoding):
+    assert decode_text(bom + TEXT.encode(encoding)) == TEXT
+
+
+def test_decode_utf8_without_bom():
+    assert decode_text(TEXT.encode("utf-8")) == TEXT
+
+
+def test_decode_latin1():
+    text = "Réclamation: la machine à café du bâtiment C ne chauffe plus, pièce défectueuse."
+    assert decode_text(text.encode("latin-1")) == text
+
+
+def test_decode_cp1252():
+    text = "Le devis s’élève à 1 200 € – merci de valider avant vendredi."
+    assert decode_text(text.encode("cp1252")) == text
+
+
+def test_decode_ascii_and_empty():
+    assert decode_text(b"plain text") == "plain text"
+    assert decode_text(b"") == ""
+
+
+# ============== decode_image ==============
+
+@pytest.mark.parametrize("fmt", ["PNG", "JPEG", "GIF", "WEBP"])
+def test_decode_image_is_bgr(fmt):
+    # OpenCV and the PIL fallback (e.g. GIF) must agree on channel order
+    encoded = io.BytesIO()
+    Image.new("RGB", (8, 8), (255, 0, 0)).save(encoded, format=fmt)
+    image_np = decode_image(encoded.getvalue())
+    assert image_np.shape == (8, 8, 3)
+    blue, green, red = image_np[4, 4].tolist()
+    assert red > 200 and green < 50 and blue < 50
+
+
+# ============== docx_paragraph_text ==============
+
+NAMESPACES = " ".join([
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"',
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"',
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"',
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"',
+])
+
+TEXT_BOX = (
+    "<w:r><mc:AlternateContent>"
+    '<mc:Choice Requires="wps"><w:drawing><wps:txbx><w:txbxContent>'
+    "<w:p><w:r><w:t>boxed</w:t></w:r></w:p>"
+    "</w:txbxContent></wps:txbx></w:drawing></mc:Choice>"
+    "<mc:Fallback><w:pict><w:txbxContent>"
+    "<w:p><w:r><w:t>boxed</w:t></w:r></w:p>"
+    "</w:txbxContent></w:pict></mc:Fallback>"
+    "</mc:AlternateContent></w:r>"
+)
+
+
+@pytest.mark.parametrize("body", [
+    "<w:r><w:t>plain</w:t></w:r>",
+    '<w:r><w:t xml:space="preserve">a </w:t></w:r><w:r><w:t>b</w:t></w:r>',
+    "<w:r><w:t>tab</w:t><w:tab/><w:t>line</w:t><w:br/><w:t>cr</w:t><w:cr/></w:r>",
+    '<w:r><w:t>page</w:t><w:br w:type="page"/><w:t>column</w:t><w:br w:type="column"/></w:r>',
+    "<w:r><w:t>non</w:t><w:noBreakHyphen/><w:t>breaking</w:t><w:ptab/></w:r>",
+    '<w:r><w:t>see </w:t></w:r><w:hyperlink r:id="rId1"><w:r><w:t>link</w:t></w:r></w:hyperlink>',
+    "<w:r><w:t>before </w:t></w:r>" + TEXT_BOX + "<w:r><w:t> after</w:t></w:r>",
+    "<w:pPr/><w:r><w:rPr><w:b/></w:rPr><w:t/></w:r>",
+])
+def test_paragraph_text_matches_python_docx(body):
+    p = parse_xml(f"<w:p {NAMESPACES}>{body}</w:p>")
+    assert docx_paragraph_text(p) == Paragraph(p, None).text
+
+
+def test_text_box_runs_not_duplicated():
+    p = parse_xml(f"<w:p {NAMESPACES}><w:r><w:t>x</w:t></w:r>{TEXT_BOX}</w:p>")
+    assert docx_paragraph_text(p) == "x"
+
+
+# ============== page_needs_ocr ==============
+
+def _scan_page(text_layer: str = "", footer: str = ""):
+    """A one-page PDF whose page is a full-page image, with optional text over it"""
+    png = io.BytesIO()
+    Image.new("RGB", (200, 280), "white").save(png, format="PNG")
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_image(page.rect, stream=png.getvalue())
+    if text_layer:
+        # Invisible text, as OCR tools lay it over a scan
+        page.insert_textbox(page.rect + (36, 36, -36, -60), text_layer, render_mode=3)
+    if footer:
+        page.insert_text((page.rect.width / 2, page.rect.height - 20), footer)
+    return doc, page
+
+
+def _needs_ocr(page) -> bool:
+    return page_needs_ocr(page, page.get_textpage())
+
+
+def test_bare_scan_needs_ocr():
+    doc, page = _scan_page()
+    assert _needs_ocr(page)
+
+
+def test_scan_with_footer_still_needs_ocr():
+    doc, page = _scan_page(footer="Page 1 / 3")
+    assert _needs_ocr(page)
+
+
+def test_scan_with_text_layer_is_skipped():
+    doc, page = _scan_page(text_layer="\n\n".join(["Line of recognized text. " * 3] * 12))
+    assert not _needs_ocr(page)
+
+
+def test_blank_page_is_skipped():
+    doc = fitz.open()
+    assert not _needs_ocr(doc.new_page())
@@ -11,20 +11,33 @@ Designed for high concurrency and production deployment.
 
 Endpoints:
 - POST /analyze - Analyze an image
+- POST /analyze/batch - Analyze up to 10 images (optionally as a background job)
+- GET /analyze/batch/{job_id} - Poll a background batch job
 - GET /health - Health check
 - GET /metrics - Service metrics
 """
 
 import os
+import asyncio
 import logging
+import uuid
 from typing import Optional, List, Dict, Any
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import httpx
+import orjson
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field, HttpUrl
 import uvicorn
 
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
 from lvm_analyzer import (
     LVMAnalyzer,
     analyze_image_with_lvm,
@@ -122,6 +135,9 @@ class MetricsResponse(BaseModel):
     failed_calls: int
     average_latency_ms: float
     success_rate: float
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_hit_rate: float = 0.0
 
 
 # ============================================
@@ -131,8 +147,59 @@ class MetricsResponse(BaseModel):
 # Singleton analyzer instance for metrics tracking
 _analyzer: Optional[LVMAnalyzer] = None
 
+# OpenRouter request timeout (seconds)
+LVM_TIMEOUT = int(os.environ.get("LVM_TIMEOUT", "60"))
+
+# How long idle OpenRouter connections stay pooled (seconds); httpx's 5s
+# default drops the warm TLS connection between sparse requests
+LVM_KEEPALIVE = float(os.environ.get("LVM_KEEPALIVE", "120"))
+
+# Timeout for fetching http(s) image URLs (seconds)
+LVM_IMAGE_TIMEOUT = float(os.environ.get("LVM_IMAGE_TIMEOUT", "20"))
+
+# Largest accepted image; data URIs are refused from their length alone
+LVM_MAX_IMAGE_MB = float(os.environ.get("LVM_MAX_IMAGE_MB", "8"))
+MAX_IMAGE_BYTES = int(LVM_MAX_IMAGE_MB * 1024 * 1024)
+MAX_IMAGE_URL_CHARS = MAX_IMAGE_BYTES * 4 // 3 + 1024
+
+# Max OpenRouter calls in flight per worker, shared by all endpoints
+LVM_CONCURRENCY = int(os.environ.get("LVM_CONCURRENCY", "5"))
+
+# Max OpenRouter requests per second per worker, and how many may go
+# back to back before that spacing applies
+LVM_RPS = float(os.environ.get("LVM_RPS", "2"))
+LVM_BURST = float(os.environ.get("LVM_BURST", "1"))
+
+# Response cache for repeat images (size 0 disables it)
+LVM_CACHE_SIZE = int(os.environ.get("LVM_CACHE_SIZE", "1000"))
+LVM_CACHE_TTL = float(os.environ.get("LVM_CACHE_TTL", "3600"))
+
+# Shared cache + metrics across workers (per-process state if unset)
+REDIS_URL = os.environ.get("REDIS_URL", "")
+
+# Background batch jobs: job_id -> {"status": "pending" | "done" | "failed", ...},
+# kept for polling until they expire (seconds), here and, with REDIS_URL, in
+# Redis for the other workers. Only states live here; the running tasks are
+# held in _running_jobs so eviction can never drop one mid-run
+LVM_JOB_TTL = float(os.environ.get("LVM_JOB_TTL", "3600"))
+_batch_jobs: TTLCache = TTLCache(maxsize=1000, ttl=LVM_JOB_TTL)
+_running_jobs: set = set()
+
+
+def check_image_size(image_url: str) -> None:
+    """Reject oversized data URIs with 413 before any decoding."""
+    if len(image_url) > MAX_IMAGE_URL_CHARS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Image exceeds {LVM_MAX_IMAGE_MB:g} MB limit"
+        )
+
 
-def get_analyzer() -> LVMAnalyzer:
+def get_analyzer(
+    http: Optional[httpx.AsyncClient] = None,
+    redis: Optional[Any] = None,
+    image_http: Optional[httpx.AsyncClient] = None
+) -> LVMAnalyzer:
     """Get or create the global analyzer instance."""
     global _analyzer
     if _analyzer is None:
@@ -143,7 +210,16 @@ def get_analyzer() -> LVMAnalyzer:
             api_key=api_key,
             site_url=os.environ.get("SITE_URL", "https://smartclaim.ai"),
             site_name=os.environ.get("SITE_NAME", "SmartClaim AI"),
-            timeout=int(os.environ.get("LVM_TIMEOUT", "60"))
+            timeout=LVM_TIMEOUT,
+            http=http,
+            rps=LVM_RPS,
+            burst=LVM_BURST,
+            max_concurrent=LVM_CONCURRENCY,
+            cache_size=LVM_CACHE_SIZE,
+            cache_ttl=LVM_CACHE_TTL,
+            redis=redis,
+            image_http=image_http,
+            max_image_bytes=MAX_IMAGE_BYTES
         )
     return _analyzer
 
@@ -157,9 +233,36 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     logger.info("LVM Service starting...")
+    # One pooled HTTP/2 client for all OpenRouter calls, so keep-alive
+    # connections (and their TLS sessions) are reused across requests
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=LVM_TIMEOUT,
+        limits=httpx.Limits(
+            max_keepalive_connections=20,
+            max_connections=50,
+            keepalive_expiry=LVM_KEEPALIVE,
+        ),
+    )
+    # Separate pool for image downloads, so slow image hosts cannot tie up
+    # the OpenRouter connections
+    app.state.image_http = httpx.AsyncClient(
+        http2=True,
+        timeout=LVM_IMAGE_TIMEOUT,
+        limits=httpx.Limits(max_keepalive_connections=50),
+    )
+    app.state.redis = None
+    if REDIS_URL:
+        if aioredis is None:
+            logger.warning("REDIS_URL set but redis is not installed - using per-worker cache and metrics")
+        else:
+            app.state.redis = aioredis.from_url(REDIS_URL, socket_timeout=1)
+            logger.info("Sharing LVM cache and metrics through Redis")
     api_key = os.environ.get("OPENROUTER_API_KEY")
     if api_key:
         logger.info("OpenRouter API key configured")
+        # Build the analyzer now rather than on the first request
+        get_analyzer(app.state.http, app.state.redis, app.state.image_http)
     else:
         logger.warning("OPENROUTER_API_KEY not set - service will fail on analyze requests")
     
@@ -167,12 +270,17 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("LVM Service shutting down...")
+    await app.state.http.aclose()
+    await app.state.image_http.aclose()
+    if app.state.redis is not None:
+        await app.state.redis.aclose()
 
 
 app = FastAPI(
     title="SmartClaim LVM Service",
     description="Vision Language Model service for industrial image analysis",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -210,11 +318,12 @@ async def get_metrics():
     """
     Get service metrics.
     
-    Returns call counts, latency, and success rate.
+    Returns call counts, latency, and success rate, summed over all
+    workers when Redis is configured.
     """
     try:
         analyzer = get_analyzer()
-        metrics = analyzer.get_metrics()
+        metrics = await analyzer.get_shared_metrics()
         return MetricsResponse(**metrics)
     except ValueError as e:
         # API key not configured
@@ -228,7 +337,7 @@ async def get_metrics():
 
 
 @app.post("/analyze", response_model=AnalyzeResponse, tags=["Analysis"])
-async def analyze_image(request: AnalyzeRequest):
+async def analyze_image(request: AnalyzeRequest, response: Response):
     """
     Analyze an industrial image.
     
@@ -250,6 +359,8 @@ async def analyze_image(request: AnalyzeRequest):
     
     Those decisions are made by downstream components.
     """
+    check_image_size(request.image_url)
+    
     try:
         analyzer = get_analyzer()
     except ValueError as e:
@@ -267,29 +378,15 @@ async def analyze_image(request: AnalyzeRequest):
     logger.info(f"Analyzing image: {request.image_url[:100]}...")
     
     try:
-        result = analyzer.analyze_image(
+        result = await analyzer.analyze_image(
             image_url=request.image_url,
             metadata=metadata_dict
         )
+        response.headers["X-Cache"] = "HIT" if result.get("cached") else "MISS"
         
-        # Convert to response model
-        return AnalyzeResponse(
-            visual_summary=result["visual_summary"],
-            detected_objects=result["detected_objects"],
-            scene_type=result["scene_type"],
-            potential_issue_detected=result["potential_issue_detected"],
-            issue_hypotheses=[
-                IssueHypothesisResponse(**hyp)
-                for hyp in result["issue_hypotheses"]
-            ],
-            visual_severity_hint=result["visual_severity_hint"],
-            image_quality=result["image_quality"],
-            requires_human_review=result["requires_human_review"],
-            processing_time_ms=result["processing_time_ms"],
-            model_version=result["model_version"],
-            raw_confidence=result.get("raw_confidence"),
-            error=result.get("error")
-        )
+        # Validate straight from the result dict in one pydantic-core pass;
+        # extra analyzer keys (observations, review_reasons, ...) are dropped
+        return AnalyzeResponse.model_validate(result)
         
     except Exception as e:
         logger.error(f"Analysis failed: {e}")
@@ -299,24 +396,92 @@ async def analyze_image(request: AnalyzeRequest):
         )
 
 
+async def _analyze_batch(
+    analyzer: LVMAnalyzer,
+    requests: List[AnalyzeRequest]
+) -> Dict[str, Any]:
+    """Analyze a batch concurrently and return results in input order."""
+    # Repeats of the same image and metadata are analyzed once and the
+    # result is fanned out to every position that submitted it
+    positions: Dict[tuple, List[int]] = {}
+    unique_requests = []
+    for i, req in enumerate(requests):
+        key = (req.image_url, req.metadata.model_dump_json(exclude_none=True) if req.metadata else "")
+        if key not in positions:
+            positions[key] = []
+            unique_requests.append(req)
+        positions[key].append(i)
+    
+    # The analyzer bounds concurrency and turns failures into fallback
+    # results, so one bad image cannot sink the batch
+    unique_results = await analyzer.analyze_images([
+        (req.image_url, req.metadata.model_dump(exclude_none=True) if req.metadata else None)
+        for req in unique_requests
+    ])
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+    for indices, result in zip(positions.values(), unique_results):
+        for i in indices:
+            results[i] = result
+    
+    return {
+        "results": results,
+        "count": len(results)
+    }
+
+
+async def _store_batch_job(job_id: str, job: Dict[str, Any]) -> None:
+    """Record a job's state here and in Redis, where every worker can poll it."""
+    _batch_jobs[job_id] = job
+    redis = getattr(app.state, "redis", None)
+    if redis is not None:
+        try:
+            await redis.set(f"lvm:job:{job_id}", orjson.dumps(job), ex=int(LVM_JOB_TTL))
+        except Exception as e:
+            logger.warning(f"Failed to store batch job {job_id} in Redis: {e}")
+
+
+async def _run_batch_job(
+    job_id: str,
+    analyzer: LVMAnalyzer,
+    requests: List[AnalyzeRequest]
+) -> None:
+    """Run a background batch and record its outcome."""
+    try:
+        job = {"status": "done", **await _analyze_batch(analyzer, requests)}
+    except asyncio.CancelledError:
+        await _store_batch_job(job_id, {"status": "failed", "error": "Batch job was cancelled"})
+        raise
+    except Exception as e:
+        logger.error(f"Batch job {job_id} failed: {e}")
+        job = {"status": "failed", "error": str(e)}
+    await _store_batch_job(job_id, job)
+
+
 @app.post("/analyze/batch", tags=["Analysis"])
 async def analyze_images_batch(
     requests: List[AnalyzeRequest],
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    response: Response,
+    background: bool = False
 ) -> Dict[str, Any]:
     """
     Batch analyze multiple images.
     
-    Note: This processes images sequentially to respect rate limits.
-    For truly parallel processing, use multiple /analyze calls.
+    Images are analyzed concurrently, at most LVM_CONCURRENCY at a time
+    to respect rate limits. Duplicate entries are analyzed only once.
     
-    Returns a list of results in the same order as inputs.
+    Returns a list of results in the same order as inputs. With
+    ?background=true, returns 202 and a job_id immediately instead; poll
+    GET /analyze/batch/{job_id} for the results.
     """
     if len(requests) > 10:
         raise HTTPException(
             status_code=400,
             detail="Maximum 10 images per batch request"
         )
+    for req in requests:
+        check_image_size(req.image_url)
     
     try:
         analyzer = get_analyzer()
@@ -326,22 +491,52 @@ async def analyze_images_batch(
             detail="Service not configured: OPENROUTER_API_KEY not set"
         )
     
-    results = []
-    for req in requests:
-        metadata_dict = None
-        if req.metadata:
-            metadata_dict = req.metadata.model_dump(exclude_none=True)
-        
-        result = analyzer.analyze_image(
-            image_url=req.image_url,
-            metadata=metadata_dict
-        )
-        results.append(result)
+    if background:
+        job_id = uuid.uuid4().hex
+        # Pending goes to Redis too, so a poll landing on another worker
+        # gets 202 rather than 404; it expires if this worker dies mid-job
+        await _store_batch_job(job_id, {"status": "pending"})
+        task = asyncio.create_task(_run_batch_job(job_id, analyzer, requests))
+        _running_jobs.add(task)
+        task.add_done_callback(_running_jobs.discard)
+        response.status_code = 202
+        return {"job_id": job_id, "status": "pending"}
     
-    return {
-        "results": results,
-        "count": len(results)
-    }
+    return await _analyze_batch(analyzer, requests)
+
+
+@app.get("/analyze/batch/{job_id}", tags=["Analysis"])
+async def get_batch_job(job_id: str, response: Response) -> Dict[str, Any]:
+    """
+    Poll a background batch job.
+    
+    Returns 202 while the job is running, then its results. Jobs expire
+    after LVM_JOB_TTL seconds.
+    """
+    # Redis first: the job may belong to another worker
+    job = None
+    redis = getattr(app.state, "redis", None)
+    if redis is not None:
+        try:
+            raw = await redis.get(f"lvm:job:{job_id}")
+        except Exception as e:
+            logger.warning(f"Failed to read batch job {job_id} from Redis: {e}")
+            raw = None
+        if raw is not None:
+            job = orjson.loads(raw)
+    
+    # Local state covers no Redis, and an outcome whose Redis write failed
+    local = _batch_jobs.get(job_id)
+    if job is None or (job["status"] == "pending" and local is not None):
+        job = local
+    
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired batch job")
+    if job["status"] == "failed":
+        raise HTTPException(status_code=500, detail=f"Batch job failed: {job['error']}")
+    if job["status"] == "pending":
+        response.status_code = 202
+    return {"job_id": job_id, **job}
 
 
 # ============================================
@@ -352,11 +547,19 @@ if __name__ == "__main__":
     port = int(os.environ.get("LVM_PORT", "8005"))
     host = os.environ.get("LVM_HOST", "0.0.0.0")
     
-    logger.info(f"Starting LVM Service on {host}:{port}")
+    # The LVM_RPS limiter (and, without REDIS_URL, cache and metrics) is per
+    # worker, so N workers allow up to N * LVM_RPS requests per second
+    workers = int(os.environ.get("LVM_WORKERS", os.environ.get("WEB_CONCURRENCY", "1")))
+    
+    logger.info(f"Starting LVM Service on {host}:{port} with {workers} worker(s)")
     
     uvicorn.run(
         "app:app",
         host=host,
         port=port,
-        reload=os.environ.get("LVM_DEBUG", "false").lower() == "true"
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        # reload cannot be combined with multiple workers
+        reload=workers == 1 and os.environ.get("LVM_DEBUG", "false").lower() == "true"
     )
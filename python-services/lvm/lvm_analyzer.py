@@ -18,16 +18,33 @@ INTEGRATION CONTRACT:
 The output feeds into the multimodal evidence aggregation layer.
 """
 
-import requests
-import json
+import asyncio
+import contextlib
+import httpx
+import orjson
 import logging
 import time
-import base64
-from typing import Optional, Dict, Any, List, Union
-from dataclasses import dataclass, asdict
+import binascii
+import copy
+import io
+import ipaddress
+import random
+import socket
+from typing import Optional, Dict, Any, List, Tuple, Union
+from dataclasses import dataclass
 from enum import Enum
-from functools import wraps
+from functools import partial, wraps
 import hashlib
+import re
+
+from cachetools import TTLCache
+from PIL import Image, ImageOps
+
+try:
+    # SIMD base64 codec with the same API; the stdlib module is the fallback
+    import pybase64 as base64
+except ImportError:
+    import base64
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -128,6 +145,26 @@ class LVMOutput:
     raw_confidence: Optional[float] = None
 
 
+# Allowed enum values, built once rather than per response
+_SCENE_TYPES = frozenset(e.value for e in SceneType)
+_ISSUE_TYPES = frozenset(e.value for e in IssueType)
+_SEVERITIES = frozenset(e.value for e in SeverityHint)
+_IMAGE_QUALITIES = frozenset(e.value for e in ImageQuality)
+
+# Enum fields of LVMOutput: (field, allowed values, fallback)
+_ENUM_FIELDS = (
+    ("scene_type", _SCENE_TYPES, "unknown"),
+    ("visual_severity_hint", _SEVERITIES, "none"),
+    ("image_quality", _IMAGE_QUALITIES, "clear"),
+)
+_LIST_FIELDS = ("confirmed_observations", "ambiguous_observations", "detected_objects")
+_BOOL_FIELDS = ("potential_issue_detected", "requires_human_review")
+
+# Values that force human review regardless of the model's own flag
+_REVIEW_QUALITIES = frozenset({"blurry", "dark", "overexposed", "obstructed", "partial"})
+_REVIEW_SEVERITIES = frozenset({"high", "critical"})
+
+
 # ============================================
 # SYSTEM PROMPT - INDUSTRIAL REASONING
 # ============================================
@@ -239,11 +276,10 @@ Respond with ONLY valid JSON — no markdown, no explanations outside the JSON:
 </OUTPUT_FORMAT>"""
 
 
-USER_PROMPT_TEMPLATE = """<CONTEXT>
-{context}
-</CONTEXT>
-
-<TASK>
+# The invariant task block comes first and the per-image context last, so
+# system prompt + task form a byte-identical prefix across requests that
+# provider-side prompt caching can reuse
+USER_PROMPT_TEMPLATE = """<TASK>
 Analyze the provided industrial image and extract objective visual evidence.
 
 REQUIREMENTS:
@@ -259,7 +295,186 @@ REMINDERS:
 - Never fabricate details not visible in the image
 - A conservative analysis flagging for human review is better than an overconfident wrong analysis
 - Output ONLY valid JSON, no markdown formatting
-</TASK>"""
+</TASK>
+
+<CONTEXT>
+{context}
+</CONTEXT>"""
+
+# The template split around its one placeholder, so building a prompt is a
+# concatenation rather than a format() parse per call
+_USER_PROMPT_HEAD, _USER_PROMPT_TAIL = USER_PROMPT_TEMPLATE.split("{context}")
+
+# Metadata keys rendered into the prompt context, in order, with labels
+_CONTEXT_FIELDS = (
+    ("source", "Source"),
+    ("location", "Location"),
+    ("department", "Department"),
+    ("timestamp", "Timestamp"),
+    ("reported_issue", "Reported issue"),
+)
+
+# Fingerprint of the prompt text, hashed once at import. Response cache keys
+# derive from it, so they stay valid across restarts (and in Redis) until
+# the prompts change.
+PROMPT_DIGEST = hashlib.blake2b(
+    (SYSTEM_PROMPT + USER_PROMPT_TEMPLATE).encode(), digest_size=16
+).digest()
+
+
+# ============================================
+# RESPONSE PARSING
+# ============================================
+
+# Markdown code fence, with or without a language tag
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+# Base64 image data URI header; match() only ever inspects the prefix
+_DATA_URI_RE = re.compile(r"data:image/[\w.+-]+;base64,", re.IGNORECASE)
+
+
+class _ObjectTracker:
+    """
+    Finds where the first top-level JSON object in a text closes.
+    
+    Text can be fed in pieces (e.g. streamed tokens); anything before the
+    first '{' is ignored and braces inside strings are skipped.
+    """
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str, start: int = 0) -> int:
+        """Index in text of the closing '}', or -1 if the object is still open."""
+        for i in range(start, len(text)):
+            ch = text[i]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == "{":
+                self.depth += 1
+            elif self.depth == 0:
+                continue
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    return i
+        return -1
+
+
+def _balanced_object(text: str, start: int) -> Optional[str]:
+    """Slice of text from the '{' at start to its matching '}', skipping braces inside strings."""
+    end = _ObjectTracker().feed(text, start)
+    return text[start:end + 1] if end != -1 else None
+
+
+def _extract_json(text: str) -> Dict[str, Any]:
+    """
+    Extract the JSON object from model output.
+    
+    Tries the raw text, then a fenced code block, then the first balanced
+    {...} span, so prose or markdown around the object does not fail the call.
+    
+    Raises:
+        ValueError: If no JSON object can be recovered
+    """
+    candidates = [text.strip()]
+    fence = _FENCE_RE.search(text)
+    if fence:
+        candidates.append(fence.group(1).strip())
+    start = text.find("{")
+    if start != -1:
+        candidates.append(_balanced_object(text, start) or text[start:text.rfind("}") + 1])
+    
+    error = None
+    for candidate in candidates:
+        try:
+            data = orjson.loads(candidate)
+        except orjson.JSONDecodeError as e:
+            error = error or e
+            continue
+        if isinstance(data, dict):
+            return data
+    raise ValueError(f"Failed to parse model response as JSON: {error or 'no JSON object found'}")
+
+
+class ImageTooLargeError(ValueError):
+    """Raised when an image exceeds the analyzer's size cap."""
+
+
+class ImageHostNotAllowedError(ValueError):
+    """Raised when an image URL resolves to a non-public address."""
+
+
+async def check_public_host(url: httpx.URL) -> None:
+    """
+    Refuse URLs whose host resolves to a private, loopback, link-local,
+    multicast or otherwise reserved address.
+    
+    Image URLs come from clients, so without this the service could be
+    pointed at internal endpoints (cloud metadata, Redis, admin ports).
+    Every resolved address must be public.
+    
+    Raises:
+        ImageHostNotAllowedError: If the host is missing, unresolvable or
+            resolves to any non-public address
+    """
+    host = url.host
+    if not host:
+        raise ImageHostNotAllowedError("Image URL has no host")
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, url.port or (443 if url.scheme == "https" else 80), type=socket.SOCK_STREAM
+        )
+    except socket.gaierror as e:
+        raise ImageHostNotAllowedError(f"Cannot resolve image host {host}: {e}") from e
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%", 1)[0])
+        if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not address.is_global or address.is_multicast:
+            raise ImageHostNotAllowedError(f"Image host {host} resolves to non-public address {address}")
+
+
+# ============================================
+# RATE LIMITING
+# ============================================
+
+class RateLimiter:
+    """
+    Token bucket refilling at rps tokens per second, holding at most burst.
+    
+    Each caller takes a token under the lock, going into debt when the
+    bucket is empty, and sleeps the debt off outside it, so concurrent
+    callers queue up without holding the lock. With burst=1 requests are
+    simply spaced 1/rps seconds apart.
+    """
+    
+    def __init__(self, rps: float, burst: float = 1):
+        self.rate = rps
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def wait(self) -> None:
+        """Sleep until this caller's token is available."""
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay:
+            await asyncio.sleep(delay)
 
 
 # ============================================
@@ -280,14 +495,39 @@ class LVMAnalyzer:
     # Configuration
     DEFAULT_TIMEOUT = 60  # seconds
     MAX_RETRIES = 3
-    RETRY_DELAY = 2  # seconds
+    RETRY_DELAY = 2  # seconds, doubled after each failed attempt
+    MAX_RETRY_DELAY = 16  # seconds
+    RETRY_JITTER = 2  # seconds; random extra wait so workers don't retry in lockstep
+    MAX_RETRY_AFTER = 60  # seconds; cap on a server-supplied Retry-After
+    RATE_LIMIT_MARKERS = ("rate limit", "rate-limit", "quota")
+    
+    # Images are downscaled to this longest edge before upload; vision
+    # tokens grow with resolution and industrial triage needs no more
+    MAX_IMAGE_EDGE = 1024
+    JPEG_QUALITY = 85
+    
+    # Redirects followed when fetching an image URL; each hop's host is checked
+    MAX_IMAGE_REDIRECTS = 5
+    
+    # Redis keys shared by all workers when a Redis client is supplied
+    REDIS_CACHE_PREFIX = "lvm:cache:"
+    REDIS_METRICS_KEY = "lvm:metrics"
     
     def __init__(
         self,
         api_key: str,
         site_url: str = "https://smartclaim.ai",
         site_name: str = "SmartClaim AI",
-        timeout: int = DEFAULT_TIMEOUT
+        timeout: int = DEFAULT_TIMEOUT,
+        http: Optional[httpx.AsyncClient] = None,
+        rps: Optional[float] = None,
+        burst: float = 1,
+        max_concurrent: Optional[int] = None,
+        cache_size: int = 1000,
+        cache_ttl: float = 3600,
+        redis: Optional[Any] = None,
+        image_http: Optional[httpx.AsyncClient] = None,
+        max_image_bytes: int = 8 * 1024 * 1024
     ):
         """
         Initialize the LVM analyzer.
@@ -297,17 +537,53 @@ class LVMAnalyzer:
             site_url: Your site URL for OpenRouter headers
             site_name: Your site name for OpenRouter headers
             timeout: Request timeout in seconds
+            http: Shared async HTTP client; pooled connections to OpenRouter
+                are reused across calls. A private client is created if omitted.
+            rps: Max OpenRouter requests per second (no limit if omitted)
+            burst: Requests allowed back to back before rps spacing applies
+            max_concurrent: Max OpenRouter requests in flight (no limit if omitted)
+            cache_size: Max cached analyses (0 disables the cache)
+            cache_ttl: Seconds a cached analysis stays valid
+            redis: Optional redis.asyncio client. When given, cached analyses
+                and metrics counters are shared across workers through it, and
+                the in-process cache acts as a first-level cache in front of it.
+            image_http: Async HTTP client for fetching image URLs, kept apart
+                from the OpenRouter pool; defaults to http.
+            max_image_bytes: Largest image accepted, before any downscaling
         """
         self.api_key = api_key
         self.site_url = site_url
         self.site_name = site_name
         self.timeout = timeout
+        self.http = http or httpx.AsyncClient(
+            http2=True,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+        self.image_http = image_http or self.http
+        self.max_image_bytes = max_image_bytes
+        self.rate_limiter = RateLimiter(rps, burst) if rps else None
+        self._slots = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+        self.redis = redis
+        self.cache_ttl = cache_ttl
+        
+        # Successful analyses keyed by image, metadata and prompt version;
+        # repeat submissions of the same image skip the model call
+        self._cache: Optional[TTLCache] = (
+            TTLCache(maxsize=cache_size, ttl=cache_ttl) if cache_size else None
+        )
+        # Identical leading message on every request; shared, never mutated
+        self._system_msg = {"role": "system", "content": SYSTEM_PROMPT}
+        # Cache-key hasher pre-seeded with the prompt and model; copied per call
+        self._key_hasher = hashlib.blake2b(PROMPT_DIGEST + self.MODEL.encode(), digest_size=32)
         
         # Metrics tracking
         self._total_calls = 0
         self._successful_calls = 0
         self._failed_calls = 0
         self._total_latency_ms = 0.0
+        self._cache_hits = 0
+        self._cache_misses = 0
         
     def _get_headers(self) -> Dict[str, str]:
         """Build request headers for OpenRouter."""
@@ -318,44 +594,189 @@ class LVMAnalyzer:
             "X-Title": self.site_name,
         }
     
+    def _cache_key(self, image_url: str, context: str, image_bytes: Optional[bytes] = None) -> str:
+        """
+        Digest of the prompt version, image and prompt context.
+        
+        Inline images are keyed by their decoded bytes, so the same file sent
+        with a different MIME label or base64 line wrapping still hits;
+        remote images are keyed by URL.
+        """
+        digest = self._key_hasher.copy()
+        digest.update(image_bytes if image_bytes is not None else image_url.encode())
+        digest.update(b"\0")
+        digest.update(context.encode())
+        return digest.hexdigest()
+    
+    def _decode_data_uri(self, image_url: str) -> Optional[bytes]:
+        """Bytes of a base64 data URI; None if not one, malformed or over max_image_bytes."""
+        data_uri = _DATA_URI_RE.match(image_url)
+        # Every 4 base64 characters carry 3 bytes; check before decoding
+        if not data_uri or (len(image_url) - data_uri.end()) * 3 // 4 > self.max_image_bytes:
+            return None
+        try:
+            return base64.b64decode(image_url[data_uri.end():])
+        except (binascii.Error, ValueError):
+            return None
+    
+    def _downscale(self, image_bytes: bytes) -> Tuple[bytes, str]:
+        """Shrink an image to MAX_IMAGE_EDGE as JPEG; see downscale_image."""
+        return downscale_image(image_bytes, self.MAX_IMAGE_EDGE, self.JPEG_QUALITY)
+    
+    async def _fetch_image(self, image_url: str, too_large: ImageTooLargeError) -> bytes:
+        """
+        Download an image, aborting once it passes max_image_bytes.
+        
+        Redirects are followed by hand so that the host of every hop, not
+        just the first, is checked with check_public_host.
+        """
+        url = httpx.URL(image_url)
+        for _ in range(self.MAX_IMAGE_REDIRECTS + 1):
+            await check_public_host(url)
+            async with self.image_http.stream("GET", url, follow_redirects=False) as response:
+                if response.is_redirect and response.next_request is not None:
+                    url = response.next_request.url
+                    continue
+                return await self._read_image(response, too_large)
+        raise httpx.TooManyRedirects(f"Image URL exceeded {self.MAX_IMAGE_REDIRECTS} redirects")
+    
+    async def _read_image(self, response: httpx.Response, too_large: ImageTooLargeError) -> bytes:
+        """Read a streamed image response, enforcing max_image_bytes."""
+        response.raise_for_status()
+        # Trust a declared length to refuse early, but count bytes regardless
+        if int(response.headers.get("content-length") or 0) > self.max_image_bytes:
+            raise too_large
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if size > self.max_image_bytes:
+                raise too_large
+            chunks.append(chunk)
+        return b"".join(chunks)
+    
+    async def _preprocess_image(self, image_url: str, image_bytes: Optional[bytes] = None) -> str:
+        """
+        Fetch the image once and downscale it before upload.
+        
+        Args:
+            image_url: HTTP/HTTPS URL or base64 data URI
+            image_bytes: The data URI's payload, if already decoded
+        
+        Returns:
+            Data URI of the (possibly resized) image, or image_url unchanged
+            if it cannot be fetched or decoded
+        
+        Raises:
+            ImageTooLargeError: If the image exceeds max_image_bytes
+        """
+        too_large = ImageTooLargeError(
+            f"Image exceeds {self.max_image_bytes / (1024 * 1024):g} MB limit"
+        )
+        data_uri = _DATA_URI_RE.match(image_url)
+        try:
+            if data_uri:
+                if image_bytes is None:
+                    # Every 4 base64 characters carry 3 bytes; check before decoding
+                    if (len(image_url) - data_uri.end()) * 3 // 4 > self.max_image_bytes:
+                        raise too_large
+                    image_bytes = base64.b64decode(image_url[data_uri.end():])
+            elif image_url.startswith(("http://", "https://")):
+                image_bytes = await self._fetch_image(image_url, too_large)
+            else:
+                return image_url
+            
+            # Decoding and resampling are CPU-bound; keep them off the event loop
+            resized, mime_type = await asyncio.to_thread(self._downscale, image_bytes)
+        except ImageTooLargeError:
+            raise
+        except Exception as e:
+            logger.warning(f"Image preprocessing skipped: {e}")
+            return image_url
+        
+        if resized is image_bytes and data_uri:
+            return image_url
+        return encode_image_bytes_to_data_uri(resized, mime_type)
+    
+    async def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached analysis in-process first, then in Redis."""
+        cached = self._cache.get(key)
+        if cached is None and self.redis is not None:
+            try:
+                raw = await self.redis.get(self.REDIS_CACHE_PREFIX + key)
+            except Exception as e:
+                logger.warning(f"Redis cache lookup failed: {e}")
+                raw = None
+            if raw is not None:
+                cached = orjson.loads(raw)
+                self._cache[key] = cached
+        return cached
+    
+    async def _cache_set(self, key: str, result: Dict[str, Any]) -> None:
+        """Store an analysis in-process and in Redis."""
+        # A copy, so changes the caller makes to result don't reach the cache
+        self._cache[key] = copy.deepcopy(result)
+        if self.redis is not None:
+            try:
+                await self.redis.set(
+                    self.REDIS_CACHE_PREFIX + key, orjson.dumps(result), ex=int(self.cache_ttl)
+                )
+            except Exception as e:
+                logger.warning(f"Redis cache store failed: {e}")
+    
+    async def _record(self, **deltas: Union[int, float]) -> None:
+        """Bump metrics counters locally and in the shared Redis hash."""
+        for name, delta in deltas.items():
+            setattr(self, f"_{name}", getattr(self, f"_{name}") + delta)
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for name, delta in deltas.items():
+                    if isinstance(delta, float):
+                        pipe.hincrbyfloat(self.REDIS_METRICS_KEY, name, delta)
+                    else:
+                        pipe.hincrby(self.REDIS_METRICS_KEY, name, delta)
+                await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Redis metrics update failed: {e}")
+    
+    def _build_context(self, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Format the metadata fields the prompt uses into its context string.
+        
+        Args:
+            metadata: Optional context about the image
+        
+        Returns:
+            Context line for the user prompt
+        """
+        context_parts = [
+            f"{label}: {metadata[key]}"
+            for key, label in _CONTEXT_FIELDS
+            if metadata.get(key)
+        ] if metadata else []
+        
+        return "; ".join(context_parts) if context_parts else "No additional context provided"
+    
     def _build_messages(
         self,
         image_url: str,
-        metadata: Optional[Dict[str, Any]] = None
+        context: str
     ) -> List[Dict[str, Any]]:
         """
         Build the message payload for the API request.
         
         Args:
             image_url: URL of the image to analyze (can be data URI)
-            metadata: Optional context about the image
+            context: Context string from _build_context
         
         Returns:
             List of message objects for the API
         """
-        # Build context string from metadata
-        context_parts = []
-        if metadata:
-            if metadata.get("source"):
-                context_parts.append(f"Source: {metadata['source']}")
-            if metadata.get("location"):
-                context_parts.append(f"Location: {metadata['location']}")
-            if metadata.get("department"):
-                context_parts.append(f"Department: {metadata['department']}")
-            if metadata.get("timestamp"):
-                context_parts.append(f"Timestamp: {metadata['timestamp']}")
-            if metadata.get("reported_issue"):
-                context_parts.append(f"Reported issue: {metadata['reported_issue']}")
-        
-        context = "; ".join(context_parts) if context_parts else "No additional context provided"
-        
-        user_prompt = USER_PROMPT_TEMPLATE.format(context=context)
+        user_prompt = _USER_PROMPT_HEAD + context + _USER_PROMPT_TAIL
         
         return [
-            {
-                "role": "system",
-                "content": SYSTEM_PROMPT
-            },
+            self._system_msg,
             {
                 "role": "user",
                 "content": [
@@ -386,28 +807,12 @@ class LVMAnalyzer:
         Raises:
             ValueError: If response cannot be parsed or validated
         """
-        # Clean the response text
-        text = response_text.strip()
-        
-        # Try to extract JSON from markdown code blocks
-        if "```json" in text:
-            start = text.find("```json") + 7
-            end = text.find("```", start)
-            if end > start:
-                text = text[start:end].strip()
-        elif "```" in text:
-            start = text.find("```") + 3
-            end = text.find("```", start)
-            if end > start:
-                text = text[start:end].strip()
-        
-        # Parse JSON
         try:
-            data = json.loads(text)
-        except json.JSONDecodeError as e:
+            data = _extract_json(response_text)
+        except ValueError as e:
             logger.error(f"JSON parse error: {e}")
             logger.error(f"Raw response: {response_text[:500]}")
-            raise ValueError(f"Failed to parse model response as JSON: {e}")
+            raise
         
         # Validate and normalize the response
         return self._validate_and_normalize(data)
@@ -441,19 +846,31 @@ class LVMAnalyzer:
             "analysis_limitations": data.get("analysis_limitations", ""),
         }
         
-        # Validate scene_type
-        valid_scene_types = [e.value for e in SceneType]
-        if normalized["scene_type"] not in valid_scene_types:
-            normalized["scene_type"] = "unknown"
-            review_reasons.append("Unknown scene type detected")
+        # Schema pass: enum values, list and boolean types
+        for field, allowed, fallback in _ENUM_FIELDS:
+            value = normalized[field]
+            if not (isinstance(value, str) and value in allowed):
+                normalized[field] = fallback
+                if field == "scene_type":
+                    review_reasons.append("Unknown scene type detected")
+        
+        for field in _LIST_FIELDS:
+            items = normalized[field]
+            if not isinstance(items, list):
+                normalized[field] = []
+            elif not all(isinstance(obj, str) for obj in items):
+                normalized[field] = [str(obj) for obj in items]
+        
+        for field in _BOOL_FIELDS:
+            normalized[field] = bool(normalized[field])
         
         # Validate and normalize issue_hypotheses
-        valid_issue_types = [e.value for e in IssueType]
         validated_hypotheses = []
-        for hyp in normalized["issue_hypotheses"]:
+        hypotheses = normalized["issue_hypotheses"]
+        for hyp in hypotheses if isinstance(hypotheses, list) else []:
             if isinstance(hyp, dict):
                 issue_type = hyp.get("issue_type", "unknown")
-                if issue_type not in valid_issue_types:
+                if not (isinstance(issue_type, str) and issue_type in _ISSUE_TYPES):
                     issue_type = "unknown"
                 
                 # Normalize confidence to [0, 1]
@@ -471,32 +888,12 @@ class LVMAnalyzer:
         
         normalized["issue_hypotheses"] = validated_hypotheses
         
-        # Validate severity hint
-        valid_severities = [e.value for e in SeverityHint]
-        if normalized["visual_severity_hint"] not in valid_severities:
-            normalized["visual_severity_hint"] = "none"
-        
-        # Validate image quality
-        valid_qualities = [e.value for e in ImageQuality]
-        if normalized["image_quality"] not in valid_qualities:
-            normalized["image_quality"] = "clear"
-        
-        # Ensure confirmed_observations and ambiguous_observations are lists
-        for field in ["confirmed_observations", "ambiguous_observations", "detected_objects"]:
-            if not isinstance(normalized[field], list):
-                normalized[field] = []
-            normalized[field] = [str(obj) for obj in normalized[field]]
-        
-        # Ensure booleans
-        normalized["potential_issue_detected"] = bool(normalized["potential_issue_detected"])
-        normalized["requires_human_review"] = bool(normalized["requires_human_review"])
-        
-        # Auto-trigger human review for certain conditions
-        if normalized["image_quality"] in ["blurry", "dark", "overexposed", "obstructed", "partial"]:
+        # Cross-field checks: auto-trigger human review for certain conditions
+        if normalized["image_quality"] in _REVIEW_QUALITIES:
             normalized["requires_human_review"] = True
             review_reasons.append(f"Image quality issue: {normalized['image_quality']}")
         
-        if normalized["visual_severity_hint"] in ["high", "critical"]:
+        if normalized["visual_severity_hint"] in _REVIEW_SEVERITIES:
             normalized["requires_human_review"] = True
             review_reasons.append(f"High severity detected: {normalized['visual_severity_hint']}")
         
@@ -514,21 +911,97 @@ class LVMAnalyzer:
             normalized["requires_human_review"] = True
             review_reasons.append(f"Low confidence hypotheses: {len(low_confidence_hypotheses)} below 0.6 threshold")
         
-        # Merge review_reasons from response with auto-generated ones
+        # Merge review_reasons from response with auto-generated ones,
+        # dropping repeats but keeping the model's reasons first
         existing_reasons = normalized.get("review_reasons", [])
         if isinstance(existing_reasons, list):
-            review_reasons = list(set(existing_reasons + review_reasons))
+            review_reasons = list(dict.fromkeys(existing_reasons + review_reasons))
         normalized["review_reasons"] = review_reasons
         
         return normalized
     
-    def _make_request_with_retry(
+    def _is_rate_limited(self, text: str) -> bool:
+        """Check an error body for rate limit or quota wording."""
+        text = text.lower()
+        return any(marker in text for marker in self.RATE_LIMIT_MARKERS)
+    
+    async def _read_stream(self, response: httpx.Response) -> Dict[str, Any]:
+        """
+        Collect a streamed (SSE) completion into a regular response dict.
+        
+        Reading stops as soon as the model's JSON object closes, so trailing
+        prose is never waited for and generation is cut off early.
+        
+        Returns:
+            {"choices": [{"message": {"content": ...}}]}, or {"error": ...}
+            if the stream reported an error
+        """
+        if not response.headers.get("content-type", "").startswith("text/event-stream"):
+            # Provider ignored "stream": plain JSON body
+            return orjson.loads(await response.aread())
+        
+        parts = []
+        tracker = _ObjectTracker()
+        async for line in response.aiter_lines():
+            # Skip blank separators and SSE comments (": OPENROUTER PROCESSING")
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            event = orjson.loads(data)
+            if event.get("error"):
+                return {"error": event["error"]}
+            choices = event.get("choices") or [{}]
+            delta = (choices[0].get("delta") or {}).get("content")
+            if delta:
+                parts.append(delta)
+                if tracker.feed(delta) != -1:
+                    break
+        return {"choices": [{"message": {"content": "".join(parts)}}]}
+    
+    def _retry_after(self, response: httpx.Response) -> Optional[float]:
+        """Seconds from a Retry-After header, capped; None if absent or a date."""
+        try:
+            return min(float(response.headers["retry-after"]), self.MAX_RETRY_AFTER)
+        except (KeyError, ValueError):
+            return None
+    
+    async def _post(self, payload: Dict[str, Any]) -> Tuple[httpx.Response, Optional[Dict[str, Any]]]:
+        """
+        Send one completion request within the concurrency and rate limits.
+        
+        Returns:
+            The response (body read) and, for a 200, the collected completion
+        """
+        async with self._slots or contextlib.nullcontext():
+            if self.rate_limiter:
+                await self.rate_limiter.wait()
+            
+            async with self.http.stream(
+                "POST",
+                self.OPENROUTER_URL,
+                headers=self._get_headers(),
+                content=orjson.dumps(payload),
+                timeout=self.timeout
+            ) as response:
+                if response.status_code == 200:
+                    return response, await self._read_stream(response)
+                await response.aread()
+                return response, None
+    
+    async def _make_request_with_retry(
         self,
         payload: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
         Make API request with retry logic.
         
+        Rate limit responses (429, or an error body mentioning rate limits or
+        quota), server errors and transport errors are retried with
+        exponential backoff plus random jitter, or after the server's
+        Retry-After (plus jitter) if given.
+        
         Args:
             payload: Request payload
             
@@ -541,44 +1014,45 @@ class LVMAnalyzer:
         last_exception = None
         
         for attempt in range(self.MAX_RETRIES):
+            retry_after = None
             try:
-                response = requests.post(
-                    url=self.OPENROUTER_URL,
-                    headers=self._get_headers(),
-                    data=json.dumps(payload),
-                    timeout=self.timeout
-                )
+                response, data = await self._post(payload)
                 
                 if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 429:
-                    # Rate limited - wait and retry
-                    wait_time = self.RETRY_DELAY * (attempt + 1)
-                    logger.warning(f"Rate limited, waiting {wait_time}s before retry")
-                    time.sleep(wait_time)
-                    continue
+                    # OpenRouter may report upstream rate limits in a 200 body
+                    error = data.get("error")
+                    if not (error and self._is_rate_limited(str(error))):
+                        return data
+                    logger.warning(f"Rate limited on attempt {attempt + 1}: {error}")
+                    last_exception = Exception(f"Rate limited: {error}")
+                elif response.status_code == 429 or self._is_rate_limited(response.text):
+                    logger.warning(f"Rate limited on attempt {attempt + 1}")
+                    last_exception = Exception(f"Rate limited: {response.text[:200]}")
+                    retry_after = self._retry_after(response)
                 elif response.status_code >= 500:
                     # Server error - retry
                     logger.warning(f"Server error {response.status_code}, retrying...")
-                    time.sleep(self.RETRY_DELAY)
-                    continue
+                    last_exception = Exception(f"API error {response.status_code}")
+                    retry_after = self._retry_after(response)
                 else:
                     # Client error - don't retry
                     raise Exception(f"API error {response.status_code}: {response.text}")
                     
-            except requests.exceptions.Timeout:
+            except httpx.TimeoutException:
                 logger.warning(f"Request timeout on attempt {attempt + 1}")
                 last_exception = Exception("Request timeout")
-            except requests.exceptions.RequestException as e:
+            except httpx.RequestError as e:
                 logger.warning(f"Request exception on attempt {attempt + 1}: {e}")
                 last_exception = e
             
             if attempt < self.MAX_RETRIES - 1:
-                time.sleep(self.RETRY_DELAY)
+                if retry_after is None:
+                    retry_after = min(self.RETRY_DELAY * 2 ** attempt, self.MAX_RETRY_DELAY)
+                await asyncio.sleep(retry_after + random.uniform(0, self.RETRY_JITTER))
         
         raise last_exception or Exception("All retries exhausted")
     
-    def analyze_image(
+    async def analyze_image(
         self,
         image_url: str,
         metadata: Optional[Dict[str, Any]] = None
@@ -609,29 +1083,53 @@ class LVMAnalyzer:
                 - requires_human_review: Boolean
                 - processing_time_ms: Analysis time
                 - model_version: Model identifier
+                - cached: Whether the result came from the response cache
         
         Raises:
             ValueError: If image cannot be analyzed
             Exception: If API call fails
         """
+        # Metadata is only read into the prompt context, once per call; keys
+        # outside it (ticket_id, user_id, ...) do not split the cache
+        context = self._build_context(metadata)
         start_time = time.time()
-        self._total_calls += 1
+        
+        # Decoded once here; used for the cache key and reused for resizing
+        image_bytes = self._decode_data_uri(image_url)
+        
+        # Counters for this call, recorded together once it finishes
+        deltas: Dict[str, Union[int, float]] = {"total_calls": 1}
+        cache_key = None
+        if self._cache is not None:
+            cache_key = self._cache_key(image_url, context, image_bytes)
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                await self._record(cache_hits=1)
+                logger.info(f"Cache hit for image: {image_url[:100]}")
+                # Deep copy so callers can't mutate the cached lists
+                result = copy.deepcopy(cached)
+                result["processing_time_ms"] = round((time.time() - start_time) * 1000, 2)
+                result["cached"] = True
+                return result
+            deltas["cache_misses"] = 1
         
         logger.info(f"Analyzing image: {image_url[:100]}...")
         
         try:
             # Build request payload
-            messages = self._build_messages(image_url, metadata)
+            image_data = await self._preprocess_image(image_url, image_bytes)
+            messages = self._build_messages(image_data, context)
             
             payload = {
                 "model": self.MODEL,
                 "messages": messages,
                 "temperature": 0.1,  # Low temperature for deterministic output
                 "max_tokens": 1024,
+                "stream": True,
             }
             
             # Make request
-            response = self._make_request_with_retry(payload)
+            response = await self._make_request_with_retry(payload)
             
             # Extract response content
             if "choices" not in response or not response["choices"]:
@@ -659,9 +1157,12 @@ class LVMAnalyzer:
             else:
                 result["raw_confidence"] = None
             
+            result["cached"] = False
+            if cache_key is not None:
+                await self._cache_set(cache_key, result)
+            
             # Update metrics
-            self._successful_calls += 1
-            self._total_latency_ms += processing_time_ms
+            await self._record(**deltas, successful_calls=1, total_latency_ms=processing_time_ms)
             
             logger.info(
                 f"Analysis complete in {processing_time_ms:.0f}ms. "
@@ -672,12 +1173,30 @@ class LVMAnalyzer:
             return result
             
         except Exception as e:
-            self._failed_calls += 1
+            await self._record(**deltas, failed_calls=1)
             logger.error(f"Analysis failed: {e}")
             
             # Return fallback response
             return self._get_fallback_response(str(e), start_time)
     
+    async def analyze_images(
+        self,
+        items: List[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several images concurrently.
+        
+        Args:
+            items: (image_url, metadata) pairs
+        
+        Returns:
+            One result per item, in input order. Failures come back as
+            fallback responses, so one bad image does not affect the rest.
+        """
+        return list(await asyncio.gather(
+            *(self.analyze_image(image_url, metadata) for image_url, metadata in items)
+        ))
+    
     def _get_fallback_response(
         self,
         error_message: str,
@@ -713,43 +1232,95 @@ class LVMAnalyzer:
             "processing_time_ms": round(processing_time_ms, 2),
             "model_version": self.MODEL,
             "raw_confidence": None,
+            "cached": False,
             "error": error_message
         }
     
-    def get_metrics(self) -> Dict[str, Any]:
-        """
-        Get analyzer metrics for monitoring.
-        
-        Returns:
-            Dictionary with total_calls, successful_calls, failed_calls,
-            average_latency_ms, success_rate
-        """
+    @staticmethod
+    def _summarize(
+        total_calls: int = 0,
+        successful_calls: int = 0,
+        failed_calls: int = 0,
+        total_latency_ms: float = 0.0,
+        cache_hits: int = 0,
+        cache_misses: int = 0
+    ) -> Dict[str, Any]:
+        """Derive averages and rates from raw counters."""
         avg_latency = (
-            self._total_latency_ms / self._successful_calls
-            if self._successful_calls > 0
+            total_latency_ms / successful_calls
+            if successful_calls > 0
             else 0
         )
         
         success_rate = (
-            self._successful_calls / self._total_calls
-            if self._total_calls > 0
+            successful_calls / total_calls
+            if total_calls > 0
+            else 0
+        )
+        
+        cache_lookups = cache_hits + cache_misses
+        cache_hit_rate = (
+            cache_hits / cache_lookups
+            if cache_lookups > 0
             else 0
         )
         
         return {
-            "total_calls": self._total_calls,
-            "successful_calls": self._successful_calls,
-            "failed_calls": self._failed_calls,
+            "total_calls": total_calls,
+            "successful_calls": successful_calls,
+            "failed_calls": failed_calls,
             "average_latency_ms": round(avg_latency, 2),
-            "success_rate": round(success_rate, 3)
+            "success_rate": round(success_rate, 3),
+            "cache_hits": cache_hits,
+            "cache_misses": cache_misses,
+            "cache_hit_rate": round(cache_hit_rate, 3)
         }
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get this process's analyzer metrics for monitoring.
+        
+        Returns:
+            Dictionary with total_calls, successful_calls, failed_calls,
+            average_latency_ms, success_rate and response cache counters
+        """
+        return self._summarize(
+            total_calls=self._total_calls,
+            successful_calls=self._successful_calls,
+            failed_calls=self._failed_calls,
+            total_latency_ms=self._total_latency_ms,
+            cache_hits=self._cache_hits,
+            cache_misses=self._cache_misses
+        )
+    
+    async def get_shared_metrics(self) -> Dict[str, Any]:
+        """
+        Get metrics aggregated across all workers.
+        
+        Reads the Redis counters when Redis is configured, falling back to
+        this process's own counters otherwise.
+        """
+        if self.redis is None:
+            return self.get_metrics()
+        try:
+            raw = await self.redis.hgetall(self.REDIS_METRICS_KEY)
+        except Exception as e:
+            logger.warning(f"Redis metrics read failed: {e}")
+            return self.get_metrics()
+        counters = {k.decode(): float(v) for k, v in raw.items()}
+        return self._summarize(
+            **{
+                name: value if name == "total_latency_ms" else int(value)
+                for name, value in counters.items()
+            }
+        )
 
 
 # ============================================
 # CONVENIENCE FUNCTION
 # ============================================
 
-def analyze_image_with_lvm(
+async def analyze_image_with_lvm(
     image_url: str,
     metadata: Optional[Dict[str, Any]] = None,
     api_key: Optional[str] = None
@@ -773,7 +1344,7 @@ def analyze_image_with_lvm(
         Structured visual evidence dictionary ready for aggregation layer
     
     Example:
-        >>> result = analyze_image_with_lvm(
+        >>> result = await analyze_image_with_lvm(
         ...     image_url="https://example.com/machine.jpg",
         ...     metadata={"location": "Factory Floor B", "department": "Maintenance"}
         ... )
@@ -786,33 +1357,112 @@ def analyze_image_with_lvm(
     if not key:
         raise ValueError("OPENROUTER_API_KEY must be provided or set in environment")
     
-    analyzer = LVMAnalyzer(api_key=key)
-    return analyzer.analyze_image(image_url, metadata)
+    async with httpx.AsyncClient(timeout=LVMAnalyzer.DEFAULT_TIMEOUT) as http:
+        analyzer = LVMAnalyzer(api_key=key, http=http)
+        return await analyzer.analyze_image(image_url, metadata)
+
+
+def analyze_image_with_lvm_sync(
+    image_url: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    api_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Blocking wrapper around analyze_image_with_lvm for scripts and other
+    synchronous callers. Must not be called from a running event loop.
+    """
+    return asyncio.run(analyze_image_with_lvm(image_url, metadata, api_key))
 
 
 # ============================================
 # IMAGE ENCODING UTILITIES
 # ============================================
 
+# A multiple of 3 bytes, so each chunk encodes to base64 without padding
+# and the encoded chunks concatenate into one valid string
+_B64_CHUNK = 57 * 1024
+
+
+def downscale_image(
+    image_bytes: bytes,
+    max_edge: int = LVMAnalyzer.MAX_IMAGE_EDGE,
+    quality: int = LVMAnalyzer.JPEG_QUALITY
+) -> Tuple[bytes, str]:
+    """
+    Shrink an image so its longest edge is at most max_edge, as JPEG.
+    
+    JPEG has no alpha channel, so transparent areas are flattened onto
+    white rather than the black a plain RGB conversion would give.
+    
+    Args:
+        image_bytes: Encoded image
+        max_edge: Longest edge allowed, in pixels
+        quality: JPEG quality for the re-encoded image
+    
+    Returns:
+        (image bytes, MIME type); the input is returned unchanged if it
+        already fits
+    """
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        if max(img.size) <= max_edge:
+            return image_bytes, img.get_format_mimetype() or "image/jpeg"
+        # Lets JPEG decode straight to a 1/2, 1/4 or 1/8 scale that still
+        # covers max_edge, instead of decoding every pixel of a phone photo
+        img.draft("RGB", (max_edge, max_edge))
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info:
+            rgba = img.convert("RGBA")
+            img = Image.new("RGB", rgba.size, (255, 255, 255))
+            img.paste(rgba, mask=rgba.getchannel("A"))
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, format="JPEG", quality=quality, optimize=True)
+    return buf.getvalue(), "image/jpeg"
+
+
 def encode_image_to_data_uri(
     image_path: str,
-    mime_type: str = "image/jpeg"
+    mime_type: str = "image/jpeg",
+    max_side: Optional[int] = LVMAnalyzer.MAX_IMAGE_EDGE,
+    quality: int = LVMAnalyzer.JPEG_QUALITY
 ) -> str:
     """
     Encode a local image file to a data URI.
     
     Args:
         image_path: Path to the image file
-        mime_type: MIME type of the image
+        mime_type: MIME type of the image, used when it is sent as-is
+        max_side: Downscale to this longest edge (re-encoded as JPEG)
+            before encoding; None, or a file Pillow cannot read, is sent
+            unchanged
+        quality: JPEG quality when downscaling
         
     Returns:
         Data URI string suitable for the API
+    
+    With max_side set (the default) the file is read whole, since Pillow
+    needs all of it to decode; only max_side=None streams it through the
+    chunked base64 encoder below.
     """
-    with open(image_path, "rb") as f:
-        image_data = f.read()
+    if max_side:
+        with open(image_path, "rb") as f:
+            image_bytes = f.read()
+        try:
+            resized, resized_mime = downscale_image(image_bytes, max_side, quality)
+        except OSError:
+            resized = image_bytes
+        if resized is not image_bytes:
+            return encode_image_bytes_to_data_uri(resized, resized_mime)
+        return encode_image_bytes_to_data_uri(image_bytes, mime_type)
     
-    base64_data = base64.b64encode(image_data).decode("utf-8")
-    return f"data:{mime_type};base64,{base64_data}"
+    # Encode as the file is read, so the raw file is never held whole
+    # alongside its base64 form
+    buf = io.BytesIO()
+    buf.write(f"data:{mime_type};base64,".encode("ascii"))
+    with open(image_path, "rb") as f:
+        for chunk in iter(partial(f.read, _B64_CHUNK), b""):
+            buf.write(base64.b64encode(chunk))
+    return buf.getvalue().decode("ascii")
 
 
 def encode_image_bytes_to_data_uri(
@@ -839,6 +1489,10 @@ def encode_image_bytes_to_data_uri(
 
 __all__ = [
     "LVMAnalyzer",
+    "RateLimiter",
+    "ImageTooLargeError",
+    "ImageHostNotAllowedError",
+    "check_public_host",
     "LVMOutput",
     "IssueHypothesis",
     "SceneType",
@@ -846,6 +1500,8 @@ __all__ = [
     "SeverityHint",
     "ImageQuality",
     "analyze_image_with_lvm",
+    "analyze_image_with_lvm_sync",
     "encode_image_to_data_uri",
     "encode_image_bytes_to_data_uri",
+    "downscale_image",
 ]
@@ -4,6 +4,7 @@ LVM Test Script
 Tests the LVM analyzer with sample images
 """
 
+import asyncio
 import os
 import sys
 import json
@@ -139,10 +140,10 @@ def test_local_analyzer():
         analyzer = LVMAnalyzer(api_key=api_key)
         
         # Test with a simple image
-        result = analyzer.analyze_image(
+        result = asyncio.run(analyzer.analyze_image(
             image_url=TEST_IMAGES[0]["url"],
             metadata=TEST_IMAGES[0]["metadata"]
-        )
+        ))
         
         print(f"✅ Local analyzer test passed!")
         print(f"   Scene: {result['scene_type']}")
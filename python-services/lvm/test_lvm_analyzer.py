@@ -0,0 +1,111 @@
+"""
+Unit tests for the LVM analyzer's JSON recovery and rate limiting
+Run from this directory: python -m pytest test_lvm_analyzer.py
+"""
+
+import asyncio
+import types
+
+import pytest
+
+import lvm_analyzer
+from lvm_analyzer import RateLimiter, _ObjectTracker, _extract_json
+
+
+# ============================================
+# _ObjectTracker
+# ============================================
+
+def test_tracker_finds_closing_brace():
+    text = 'Here you go: {"a": {"b": 1}} trailing'
+    assert _ObjectTracker().feed(text) == text.index("}}") + 1
+
+
+def test_tracker_skips_braces_inside_strings():
+    text = '{"summary": "a } and a { in prose", "quote": "say \\"}\\""} rest'
+    end = _ObjectTracker().feed(text)
+    assert text[end + 1:] == " rest"
+
+
+def test_tracker_across_streamed_pieces():
+    tracker = _ObjectTracker()
+    pieces = ['Sure! {"visual_summary": "open {', ' brace\\', '"", "n": {"x": 1', "}", "} done"]
+    results = [tracker.feed(piece) for piece in pieces]
+    assert results == [-1, -1, -1, -1, 0]
+
+
+def test_tracker_open_object():
+    assert _ObjectTracker().feed('{"a": "}"') == -1
+
+
+# ============================================
+# _extract_json
+# ============================================
+
+def test_extract_plain_json():
+    assert _extract_json('{"a": 1}') == {"a": 1}
+
+
+def test_extract_fenced_json():
+    assert _extract_json('Result:\n```json\n{"a": 1}\n```\nThanks') == {"a": 1}
+
+
+def test_extract_json_with_prose_and_braces_in_strings():
+    text = 'Analysis {"summary": "pipe } leaking {", "ok": true} and {"extra": 2}'
+    assert _extract_json(text) == {"summary": "pipe } leaking {", "ok": True}
+
+
+def test_extract_json_rejects_non_objects():
+    with pytest.raises(ValueError):
+        _extract_json("[1, 2, 3]")
+    with pytest.raises(ValueError):
+        _extract_json("no json here")
+
+
+# ============================================
+# RateLimiter
+# ============================================
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Fake monotonic clock for RateLimiter; asyncio.sleep records the delay
+    instead of waiting, so timings are exact and the tests take no time.
+    """
+    fake = types.SimpleNamespace(now=100.0, sleeps=[])
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay):
+        fake.sleeps.append(round(delay, 6))
+        await real_sleep(0)
+
+    monkeypatch.setattr(lvm_analyzer, "time", types.SimpleNamespace(monotonic=lambda: fake.now))
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    return fake
+
+
+async def _wait_all(limiter: RateLimiter, calls: int) -> None:
+    await asyncio.gather(*(limiter.wait() for _ in range(calls)))
+
+
+def test_rate_limiter_spaces_requests(clock):
+    asyncio.run(_wait_all(RateLimiter(rps=20), 5))
+    # The first caller goes at once; each further one waits one more 1/rps
+    assert clock.sleeps == [0.05, 0.1, 0.15, 0.2]
+
+
+def test_rate_limiter_allows_burst(clock):
+    asyncio.run(_wait_all(RateLimiter(rps=10, burst=3), 4))
+    assert clock.sleeps == [0.1]
+
+
+def test_rate_limiter_refills_while_idle(clock):
+    async def scenario():
+        limiter = RateLimiter(rps=4, burst=2)
+        await _wait_all(limiter, 2)
+        clock.now += 0.25  # one token back
+        await limiter.wait()
+        await limiter.wait()
+
+    asyncio.run(scenario())
+    assert clock.sleeps == [0.25]
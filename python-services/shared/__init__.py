@@ -0,0 +1,7 @@
+# python-services/shared/__init__.py
+"""
+SmartClaim shared service code
+Modules used by more than one service. Images built with the python-services
+directory as context copy this package next to the service's app.py; for local runs put
+python-services/ on PYTHONPATH.
+"""
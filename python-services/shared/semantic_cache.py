@@ -0,0 +1,120 @@
+# python-services/shared/semantic_cache.py
+"""
+SmartClaim Semantic Cache
+Approximate-match response cache keyed by text embeddings.
+
+Random-projection LSH buckets narrow the lookup to a few candidates; a
+candidate is a hit only if its cosine similarity clears the threshold.
+Entries are evicted LRU-first and expire after a TTL.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+import itertools
+import time
+
+import numpy as np
+
+
+class SemanticCache:
+    """LSH-indexed cache of responses for near-duplicate inputs"""
+
+    def __init__(
+        self,
+        num_tables: int = 8,
+        bits: int = 16,
+        threshold: float = 0.95,
+        maxsize: int = 2048,
+        ttl: float = 3600.0,
+        seed: int = 0,
+    ):
+        self.num_tables = num_tables
+        self.bits = bits
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._rng = np.random.default_rng(seed)
+        self._planes: Optional[np.ndarray] = None  # built on first use, once the dimension is known
+        self._pow2 = 1 << np.arange(bits, dtype=np.int64)
+        self._ids = itertools.count()
+        # entry id -> (unit vector, value, expiry, bucket keys)
+        self._entries: "OrderedDict[int, Tuple[np.ndarray, Any, float, List[Tuple]]]" = OrderedDict()
+        self._buckets: Dict[Tuple, Set[int]] = {}
+
+    def _bucket_keys(self, unit: np.ndarray, namespace: Hashable) -> List[Tuple]:
+        """One (namespace, table, hash) key per LSH table"""
+        if self._planes is None:
+            self._planes = self._rng.standard_normal(
+                (self.num_tables * self.bits, unit.shape[0])
+            ).astype(np.float32)
+        signs = (self._planes @ unit > 0).reshape(self.num_tables, self.bits)
+        hashes = signs @ self._pow2
+        return [(namespace, table, int(h)) for table, h in enumerate(hashes)]
+
+    def _drop(self, entry_id: int) -> None:
+        _, _, _, keys = self._entries.pop(entry_id)
+        for key in keys:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    @staticmethod
+    def _normalize(vec) -> Optional[np.ndarray]:
+        unit = np.asarray(vec, dtype=np.float32)
+        norm = float(np.linalg.norm(unit))
+        return unit / norm if norm else None
+
+    def get(self, vec, namespace: Hashable = "") -> Optional[Any]:
+        """Return the cached value most similar to vec, if above the threshold"""
+        unit = self._normalize(vec)
+        if unit is None or (self._planes is not None and unit.shape[0] != self._planes.shape[1]):
+            self.misses += 1
+            return None
+
+        candidates: Set[int] = set()
+        for key in self._bucket_keys(unit, namespace):
+            candidates.update(self._buckets.get(key, ()))
+
+        now = time.monotonic()
+        best_id, best_sim = None, self.threshold
+        for entry_id in candidates:
+            stored, _, expires_at, _ = self._entries[entry_id]
+            if expires_at < now:
+                self._drop(entry_id)
+                continue
+            sim = float(stored @ unit)
+            if sim >= best_sim:
+                best_id, best_sim = entry_id, sim
+
+        if best_id is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(best_id)
+        return self._entries[best_id][1]
+
+    def set(self, vec, value: Any, namespace: Hashable = "") -> None:
+        """Store value under vec's LSH buckets, evicting the least recently used entry if full"""
+        unit = self._normalize(vec)
+        if unit is None:
+            return
+        keys = self._bucket_keys(unit, namespace)
+        entry_id = next(self._ids)
+        self._entries[entry_id] = (unit, value, time.monotonic() + self.ttl, keys)
+        for key in keys:
+            self._buckets.setdefault(key, set()).add(entry_id)
+        while len(self._entries) > self.maxsize:
+            self._drop(next(iter(self._entries)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "threshold": self.threshold,
+        }
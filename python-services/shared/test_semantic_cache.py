@@ -0,0 +1,92 @@
+"""
+Unit tests for SemanticCache
+Run from python-services/: python -m pytest shared
+"""
+
+import time
+
+import numpy as np
+
+from shared.semantic_cache import SemanticCache
+
+
+def _unit(vec):
+    vec = np.asarray(vec, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+def _near(base, cosine, seed=1):
+    """A unit vector whose cosine similarity to base is exactly cosine"""
+    noise = np.random.default_rng(seed).standard_normal(base.shape[0]).astype(np.float32)
+    noise -= (noise @ base) * base  # orthogonal to base
+    noise /= np.linalg.norm(noise)
+    return cosine * base + np.sqrt(1 - cosine ** 2) * noise
+
+
+def _cache(**kwargs):
+    # Few bits per table, so near vectors reliably share a bucket and the
+    # threshold alone decides hit or miss
+    return SemanticCache(**{"bits": 4, "threshold": 0.95, **kwargs})
+
+
+def test_identical_vector_hits():
+    cache = _cache()
+    vec = _unit(np.arange(1, 65))
+    cache.set(vec, "value")
+    assert cache.get(vec) == "value"
+    assert cache.stats()["hits"] == 1
+
+
+def test_hit_above_threshold_miss_below():
+    cache = _cache()
+    base = _unit(np.random.default_rng(0).standard_normal(64))
+    cache.set(base, "value")
+    assert cache.get(_near(base, 0.98)) == "value"
+    assert cache.get(_near(base, 0.90)) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_closest_entry_wins():
+    cache = _cache(threshold=0.8)
+    base = _unit(np.random.default_rng(0).standard_normal(64))
+    cache.set(_near(base, 0.85, seed=2), "far")
+    cache.set(_near(base, 0.99, seed=3), "close")
+    assert cache.get(base) == "close"
+
+
+def test_entries_expire_after_ttl():
+    cache = _cache(ttl=0.05)
+    vec = _unit(np.arange(1, 65))
+    cache.set(vec, "value")
+    assert cache.get(vec) == "value"
+    time.sleep(0.1)
+    assert cache.get(vec) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_namespaces_are_separate():
+    cache = _cache()
+    vec = _unit(np.arange(1, 65))
+    cache.set(vec, "a", namespace="a")
+    assert cache.get(vec, namespace="b") is None
+    assert cache.get(vec, namespace="a") == "a"
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = _cache(maxsize=2)
+    vecs = [_unit(np.random.default_rng(seed).standard_normal(64)) for seed in range(3)]
+    cache.set(vecs[0], 0)
+    cache.set(vecs[1], 1)
+    assert cache.get(vecs[0]) == 0  # vecs[1] is now the oldest
+    cache.set(vecs[2], 2)
+    assert cache.get(vecs[1]) is None
+    assert cache.get(vecs[0]) == 0
+    assert cache.get(vecs[2]) == 2
+
+
+def test_zero_and_mismatched_vectors_miss():
+    cache = _cache()
+    cache.set(np.zeros(64), "zero")
+    assert cache.stats()["entries"] == 0
+    cache.set(_unit(np.arange(1, 65)), "value")
+    assert cache.get(_unit(np.arange(1, 33))) is None